@@ -3,12 +3,14 @@ import mathutils
 import json
 import threading
 import socket
+import selectors
 import time
 import requests
 import tempfile
 import traceback
 import os
 import shutil
+import functools
 from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty
 
 bl_info = {
@@ -23,6 +25,17 @@ bl_info = {
 
 RODIN_FREE_TRIAL_KEY = "k9TcfFoEhNd9cCPP2guHAHHHkctZHIRhZDywZ1euGUXwihbYLpOjQhofby80NJez"
 
+# Most clients served at once; each holds a handler thread for its connection
+MAX_CLIENTS = 8
+
+# Last bytes a complete command can end with: the closing brace, or whitespace after it
+_JSON_TAIL_BYTES = b"} \t\r\n"
+
+@functools.lru_cache(maxsize=128)
+def _compile_code(code):
+    """Compile a code snippet for execute_code, caching the result per source string"""
+    return compile(code, "<mcp>", "exec")
+
 class BlenderMCPServer:
     def __init__(self, host='localhost', port=9876):
         self.host = host
@@ -30,6 +43,40 @@ class BlenderMCPServer:
         self.running = False
         self.socket = None
         self.server_thread = None
+        # stop() writes to this pair to wake the accept loop, so it can block without a timeout
+        self._wake_r = None
+        self._wake_w = None
+        # Caps handler threads; connected clients are tracked so stop() can disconnect them
+        self._client_slots = threading.BoundedSemaphore(MAX_CLIENTS)
+        self._clients = set()
+        self._clients_lock = threading.Lock()
+        
+        # Handler tables are built once; commands only pick the ones enabled in the scene
+        # Base handlers that are always available
+        self._base_handlers = {
+            "get_scene_info": self.get_scene_info,
+            "create_object": self.create_object,
+            "modify_object": self.modify_object,
+            "delete_object": self.delete_object,
+            "get_object_info": self.get_object_info,
+            "execute_code": self.execute_code,
+            "set_material": self.set_material,
+            "get_polyhaven_status": self.get_polyhaven_status,
+            "get_hyper3d_status": self.get_hyper3d_status,
+        }
+        # Polyhaven handlers, only available if enabled
+        self._polyhaven_handlers = {
+            "get_polyhaven_categories": self.get_polyhaven_categories,
+            "search_polyhaven_assets": self.search_polyhaven_assets,
+            "download_polyhaven_asset": self.download_polyhaven_asset,
+            "set_texture": self.set_texture,
+        }
+        # Hyper3d handlers, only available if enabled
+        self._hyper3d_handlers = {
+            "create_rodin_job": self.create_rodin_job,
+            "poll_rodin_job_status": self.poll_rodin_job_status,
+            "import_generated_asset": self.import_generated_asset,
+        }
     
     def start(self):
         if self.running:
@@ -44,6 +91,8 @@ class BlenderMCPServer:
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket.bind((self.host, self.port))
             self.socket.listen(1)
+            self.socket.setblocking(False)
+            self._wake_r, self._wake_w = socket.socketpair()
             
             # Start server thread
             self.server_thread = threading.Thread(target=self._server_loop)
@@ -58,13 +107,12 @@ class BlenderMCPServer:
     def stop(self):
         self.running = False
         
-        # Close socket
-        if self.socket:
+        # Wake the accept loop so it sees the cleared flag immediately
+        if self._wake_w:
             try:
-                self.socket.close()
+                self._wake_w.send(b"x")
             except:
                 pass
-            self.socket = None
         
         # Wait for thread to finish
         if self.server_thread:
@@ -75,29 +123,67 @@ class BlenderMCPServer:
                 pass
             self.server_thread = None
         
+        # Disconnect clients so their handler threads leave recv and exit
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except:
+                pass
+        
+        # Close sockets
+        for sock in (self.socket, self._wake_r, self._wake_w):
+            if sock:
+                try:
+                    sock.close()
+                except:
+                    pass
+        self.socket = self._wake_r = self._wake_w = None
+        
         print("BlenderMCP server stopped")
     
     def _server_loop(self):
         """Main server loop in a separate thread"""
         print("Server thread started")
-        self.socket.settimeout(1.0)  # Timeout to allow for stopping
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        selector.register(self._wake_r, selectors.EVENT_READ)
         
         while self.running:
             try:
+                # Blocks until a client connects or stop() writes to the wake pair
+                if not any(key.fileobj is self.socket for key, _ in selector.select()):
+                    # Woken by stop(); the loop condition re-checks the running flag
+                    continue
+                
                 # Accept new connection
                 try:
                     client, address = self.socket.accept()
+                    client.setblocking(True)
+                    if not self._client_slots.acquire(blocking=False):
+                        print(f"Rejecting client {address}: {MAX_CLIENTS} clients already connected")
+                        try:
+                            client.sendall(json.dumps({
+                                "status": "error",
+                                "message": "Too many clients connected"
+                            }).encode('utf-8'))
+                        except:
+                            pass
+                        client.close()
+                        continue
                     print(f"Connected to client: {address}")
                     
-                    # Handle client in a separate thread
+                    # Handle client in a separate thread; daemon so a client parked
+                    # in recv can't keep Blender from exiting
                     client_thread = threading.Thread(
                         target=self._handle_client,
                         args=(client,)
                     )
                     client_thread.daemon = True
                     client_thread.start()
-                except socket.timeout:
-                    # Just check running condition
+                except BlockingIOError:
+                    # Connection went away before accept
                     continue
                 except Exception as e:
                     print(f"Error accepting connection: {str(e)}")
@@ -108,28 +194,44 @@ class BlenderMCPServer:
                     break
                 time.sleep(0.5)
         
+        selector.close()
         print("Server thread stopped")
     
     def _handle_client(self, client):
         """Handle connected client"""
         print("Client handler started")
+        with self._clients_lock:
+            self._clients.add(client)
         client.settimeout(None)  # No timeout
-        buffer = b''
+        # Commands are received straight into one buffer that doubles when full,
+        # rather than re-concatenating everything received so far on each recv
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        received = 0
         
         try:
             while self.running:
                 # Receive data
                 try:
-                    data = client.recv(8192)
-                    if not data:
+                    if received == len(buf):
+                        # The view must be released before the buffer can resize
+                        view.release()
+                        buf.extend(bytes(len(buf)))
+                        view = memoryview(buf)
+                    n = client.recv_into(view[received:])
+                    if not n:
                         print("Client disconnected")
                         break
+                    received += n
                     
-                    buffer += data
+                    # A command is a JSON object, so it can't be complete unless the
+                    # data ends in '}' (or trailing whitespace); skip the parse otherwise
+                    if buf[received - 1] not in _JSON_TAIL_BYTES:
+                        continue
                     try:
                         # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
+                        command = json.loads(buf[:received])
+                        received = 0
                         
                         # Execute command in Blender's main thread
                         def execute_wrapper():
@@ -164,10 +266,13 @@ class BlenderMCPServer:
         except Exception as e:
             print(f"Error in client handler: {str(e)}")
         finally:
+            with self._clients_lock:
+                self._clients.discard(client)
             try:
                 client.close()
             except:
                 pass
+            self._client_slots.release()
             print("Client handler stopped")
 
     def execute_command(self, command):
@@ -199,39 +304,11 @@ class BlenderMCPServer:
         if cmd_type == "get_polyhaven_status":
             return {"status": "success", "result": self.get_polyhaven_status()}
         
-        # Base handlers that are always available
-        handlers = {
-            "get_scene_info": self.get_scene_info,
-            "create_object": self.create_object,
-            "modify_object": self.modify_object,
-            "delete_object": self.delete_object,
-            "get_object_info": self.get_object_info,
-            "execute_code": self.execute_code,
-            "set_material": self.set_material,
-            "get_polyhaven_status": self.get_polyhaven_status,
-            "get_hyper3d_status": self.get_hyper3d_status,
-        }
-        
-        # Add Polyhaven handlers only if enabled
-        if bpy.context.scene.blendermcp_use_polyhaven:
-            polyhaven_handlers = {
-                "get_polyhaven_categories": self.get_polyhaven_categories,
-                "search_polyhaven_assets": self.search_polyhaven_assets,
-                "download_polyhaven_asset": self.download_polyhaven_asset,
-                "set_texture": self.set_texture,
-            }
-            handlers.update(polyhaven_handlers)
-        
-        # Add Hyper3d handlers only if enabled
-        if bpy.context.scene.blendermcp_use_hyper3d:
-            polyhaven_handlers = {
-                "create_rodin_job": self.create_rodin_job,
-                "poll_rodin_job_status": self.poll_rodin_job_status,
-                "import_generated_asset": self.import_generated_asset,
-            }
-            handlers.update(polyhaven_handlers)
-
-        handler = handlers.get(cmd_type)
+        handler = self._base_handlers.get(cmd_type)
+        if handler is None and bpy.context.scene.blendermcp_use_polyhaven:
+            handler = self._polyhaven_handlers.get(cmd_type)
+        if handler is None and bpy.context.scene.blendermcp_use_hyper3d:
+            handler = self._hyper3d_handlers.get(cmd_type)
         if handler:
             try:
                 print(f"Executing handler for {cmd_type}")
@@ -482,7 +559,8 @@ class BlenderMCPServer:
         try:
             # Create a local namespace for execution
             namespace = {"bpy": bpy}
-            exec(code, namespace)
+            # Repeated snippets reuse their compiled code object
+            exec(_compile_code(code), namespace)
             return {"executed": True}
         except Exception as e:
             raise Exception(f"Code execution error: {str(e)}")
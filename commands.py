@@ -1,24 +1,110 @@
 try:
     import hou
 except ImportError:
-    # Create a dummy version for when running outside Houdini
-    class DummyHou:
-        def __getattr__(self, name):
-            return lambda *args, **kwargs: None
-    hou = DummyHou()
+    # Stand-in for when running outside Houdini; MagicMock caches child attributes
+    from unittest.mock import MagicMock
+    hou = MagicMock()
+    hou.OperationFailed = type("OperationFailed", (Exception,), {})
+    hou.ObjectWasDeleted = type("ObjectWasDeleted", (Exception,), {})
 
+import sys
 import json
-import traceback
+import collections
 import logging
+import functools
+import reprlib
+import types
 from typing import Dict, Any
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from simulations import create_fluid_simulation, create_pyro_simulation
+from simulations import run_simulation as _run_simulation
+
+# orjson is an optional speedup; fall back to the stdlib encoder when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("HoudiniMCP.Commands")
 
+# Key used to hand the serialized response bytes to the socket server
+# (must match server.SERIALIZED_RESPONSE_KEY)
+SERIALIZED_RESPONSE_KEY = "_serialized"
+
+if orjson is not None:
+    # Houdini hands back numpy arrays and int-keyed dicts; let orjson encode them natively
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+else:
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes"""
+        return json.dumps(obj).encode('utf-8')
+
+# Size-capped repr for the variables reported by execute_houdini_code, so snippets
+# that leave large geometry or point lists in their locals cannot blow up the response
+_VARIABLE_REPR = reprlib.Repr()
+_VARIABLE_REPR.maxstring = 256
+_VARIABLE_REPR.maxother = 256
+_VARIABLE_REPR.maxlist = 32
+_VARIABLE_REPR.maxtuple = 32
+_VARIABLE_REPR.maxdict = 16
+
+# HOM wrappers whose repr calls back into Houdini (geometry can be huge); the
+# response only names their type. Filtered to real classes for the stand-in hou.
+_OPAQUE_VARIABLE_TYPES = tuple(
+    t for t in (getattr(hou, "Geometry", None), getattr(hou, "Node", None)) if isinstance(t, type)
+)
+
+def _describe_variable(value: Any) -> str:
+    """Short, size-capped description of a variable left behind by a code snippet"""
+    if isinstance(value, _OPAQUE_VARIABLE_TYPES):
+        return f"<{type(value).__name__}>"
+    return _VARIABLE_REPR.repr(value)
+
+@functools.lru_cache(maxsize=128)
+def _compile_code(code: str) -> types.CodeType:
+    """Compile a code snippet for execute_houdini_code, caching the result per source string"""
+    return compile(code, "<mcp>", "exec")
+
+# Most node paths kept by the lookup cache; scripts touching more nodes than
+# this just fall back to hou.node for the least recently used ones
+NODE_CACHE_SIZE = 256
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+def _find_unserializable(value: Any, path: str = "response") -> Any:
+    """
+    Walk a value and return the path of the first leaf that is not a JSON
+    native type, or None if everything is serializable
+    """
+    if isinstance(value, _JSON_SCALARS):
+        return None
+    if isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            bad = _find_unserializable(item, f"{path}[{i}]")
+            if bad is not None:
+                return bad
+        return None
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, _JSON_SCALARS):
+                return f"{path} (key {key!r})"
+            bad = _find_unserializable(item, f"{path}.{key}")
+            if bad is not None:
+                return bad
+        return None
+    return f"{path} ({type(value).__name__})"
+
+class ValidatedResponse(dict):
+    """
+    Response that a handler has built in the final wire shape: it has
+    "status" and "message" fields and only JSON-native values.
+    execute_command returns these without re-validating them.
+    """
+
 class CommandExecutor:
     def __init__(self):
         self.logger = logger
@@ -33,30 +119,32 @@ class CommandExecutor:
             "create_fluid_sim": self.create_fluid_sim,
             "create_pyro_sim": self.create_pyro_sim,
             "run_simulation": self.run_simulation,
-            "execute_houdini_code": self.execute_houdini_code
+            "execute_houdini_code": self.execute_houdini_code,
+            "bulk_ops": self.bulk_ops
+        }
+        # The handler set is fixed after construction
+        self._command_names = tuple(self.command_handlers)
+        # Parameters each command cannot run without (mirrors command_schema.json)
+        self._required_params = {
+            "create_node": ("node_type",),
+            "connect_nodes": ("from_path", "to_path"),
+            "set_param": ("node_path", "param_name", "param_value"),
+            "run_simulation": ("node_path",),
+            "execute_houdini_code": ("code",),
+            "bulk_ops": ("ops",)
+        }
+        # Path -> node lookups for the node-editing handlers, dropped whenever the
+        # scene is cleared or another hip file is loaded
+        self._node_cache = collections.OrderedDict()
+        hou.hipFile.addEventCallback(self._on_hip_file_event)
+        # Top-level context nodes, resolved on first use by get_scene_info
+        self._context_nodes = None
+        # Typed evaluators per parm data type, used by get_object_info
+        self._parm_evaluators = {
+            hou.parmData.Int: hou.ParmTuple.evalAsInts,
+            hou.parmData.Float: hou.ParmTuple.evalAsFloats,
+            hou.parmData.String: hou.ParmTuple.evalAsStrings
         }
-    
-    def log(self, level: str, message: str) -> None:
-        """
-        Log a message with the specified level
-        
-        Args:
-            level: Log level (info, error, debug, warning)
-            message: Message to log
-        """
-        if level == "info":
-            self.logger.info(message)
-            print(message)
-        elif level == "error":
-            self.logger.error(message)
-            print(message)
-        elif level == "debug":
-            self.logger.debug(message)
-        elif level == "warning":
-            self.logger.warning(message)
-            print(message)
-        else:
-            print(message)
     
     def execute_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -69,62 +157,94 @@ class CommandExecutor:
             Dictionary with command execution results
         """
         try:
-            # Log the command being executed
-            self.log("info", f"Executing command: {command.get('type')} with params: {command.get('params', {})}")
+            # Log the command being executed (payloads can be large, so only at debug level)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Executing command: %s with params: %s", command.get("type"), command.get("params", {}))
             
-            # Get command type and params
-            cmd_type = command.get("type")
-            params = command.get("params", {})
+            response = self._normalize_response(self._dispatch(command))
             
-            # Check if we have a handler for this command
-            if cmd_type in self.command_handlers:
-                response = self.command_handlers[cmd_type](params)
-            else:
-                return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
+            # Handlers that already produce the final shape skip the serialization check
+            if isinstance(response, ValidatedResponse):
+                return response
             
-            # Log the raw response
-            self.log("info", f"Raw response: {response}")
-            
-            # Ensure consistent response format
-            if not isinstance(response, dict):
-                self.log("warning", f"Response is not a dictionary: {response}")
-                return {"status": "error", "message": f"Invalid response format: {str(response)}"}
-            
-            # Make sure we have a status field
-            if "status" not in response:
-                self.log("warning", f"Response missing status field: {response}")
-                if "error" in response:
-                    return {"status": "error", "message": response["error"]}
-                else:
-                    # Default to success if no error found
-                    response["status"] = "success"
-                    if "message" not in response:
-                        response["message"] = "Command executed successfully"
-            
-            # One final check to ensure we have a message
-            if "message" not in response:
-                self.log("warning", f"Response missing message field: {response}")
-                if response["status"] == "error":
-                    response["message"] = "An unknown error occurred"
-                else:
-                    response["message"] = "Command executed successfully"
-            
-            # Make sure the response is serializable to JSON
+            # Serialize the response once; this doubles as the JSON-serializability check
+            # (orjson.JSONEncodeError is a subclass of TypeError)
             try:
-                json.dumps(response)
+                payload = dumps_bytes(response)
             except (TypeError, ValueError) as e:
-                self.log("warning", f"Response is not JSON serializable: {response}, Error: {str(e)}")
+                # Only walk the response on this failure path, to point at the offending field
+                location = _find_unserializable(response)
+                self.logger.warning("Response is not JSON serializable at %s: %s", location, e)
                 return {
                     "status": "error", 
                     "message": f"Server generated a non-serializable response: {str(e)}"
+                               + (f" (at {location})" if location else "")
                 }
             
-            self.log("info", f"Final validated response: {response}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Final validated response: %s", response)
+            response[SERIALIZED_RESPONSE_KEY] = payload
             return response
         except Exception as e:
-            self.log("error", f"ERROR in execute_command: {str(e)}")
-            traceback.print_exc()
-            return {"status": "error", "message": str(e)}
+            self.logger.error("ERROR in execute_command: %s: %s", type(e).__name__, e)
+            self.logger.debug("execute_command failure", exc_info=True)
+            return {"status": "error", "message": str(e), "exc_type": type(e).__name__}
+    
+    def _dispatch(self, command: Dict[str, Any]) -> Any:
+        """Validate a command and run its handler, returning the raw handler result"""
+        cmd_type = command.get("type")
+        params = command.get("params", {})
+        if isinstance(cmd_type, str):
+            # Strings decoded off the wire are not interned; interning lets the
+            # handler lookup match the (compiler-interned) literal keys by identity
+            cmd_type = sys.intern(cmd_type)
+        
+        # Look up the handler for this command
+        handler = self.command_handlers.get(cmd_type)
+        if handler is None:
+            return ValidatedResponse({"status": "error", "message": f"Unknown command type: {cmd_type}"})
+        
+        # Reject malformed commands before running the handler
+        missing = [p for p in self._required_params.get(cmd_type, ()) if p not in params]
+        if missing:
+            noun = "parameter" if len(missing) == 1 else "parameters"
+            return ValidatedResponse({
+                "status": "error",
+                "message": f"Missing required {noun}: {', '.join(missing)}"
+            })
+        
+        return handler(params)
+    
+    def _normalize_response(self, response: Any) -> Dict[str, Any]:
+        """Give a handler result the status/message shape every response has"""
+        # Handlers that already produce the final shape skip validation
+        if isinstance(response, ValidatedResponse):
+            return response
+        
+        # Log the raw response
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Raw response: %s", response)
+        
+        # Ensure consistent response format
+        if not isinstance(response, dict):
+            self.logger.warning("Response is not a dictionary: %s", response)
+            return {"status": "error", "message": f"Invalid response format: {str(response)}"}
+        
+        # Make sure we have a status field, treating legacy {"error": ...} responses as errors
+        status = response.get("status")
+        if status is None:
+            # Data-only handlers (get_scene_info, get_object_info) routinely omit it
+            self.logger.debug("Response missing status field: %s", response)
+            error = response.get("error")
+            if error is not None:
+                return {"status": "error", "message": error}
+            # Default to success if no error found
+            status = response["status"] = "success"
+        
+        # Make sure we have a message
+        if "message" not in response:
+            response["message"] = "An unknown error occurred" if status == "error" else "Command executed successfully"
+        return response
     
     # Command handlers
     def list_available_commands(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -137,10 +257,11 @@ class CommandExecutor:
         Returns:
             Dictionary with list of available commands
         """
-        return {
+        return ValidatedResponse({
             "status": "success",
-            "commands": list(self.command_handlers.keys())
-        }
+            "message": "Command executed successfully",
+            "commands": list(self._command_names)
+        })
     
     def create_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -155,60 +276,63 @@ class CommandExecutor:
         Returns:
             Dictionary with creation status and node path
         """
-        self.log("info", f"Creating node with params: {params}")
+        self.logger.info("Creating node with params: %s", params)
         parent_path = params.get("parent_path", "/obj")
         node_type = params.get("node_type")
         node_name = params.get("node_name", None)
         
         if not node_type:
-            self.log("error", "ERROR: Missing required parameter: node_type")
-            return {
+            self.logger.error("ERROR: Missing required parameter: node_type")
+            return ValidatedResponse({
                 "status": "error", 
                 "message": "Missing required parameter: node_type"
-            }
+            })
             
         try:
             # Get parent node
             try:
-                parent = hou.node(parent_path)
+                parent = self._resolve_node(parent_path)
                 if not parent:
-                    self.log("error", f"ERROR: Parent node not found: {parent_path}")
-                    return {
+                    self.logger.error(f"ERROR: Parent node not found: {parent_path}")
+                    return ValidatedResponse({
                         "status": "error",
                         "message": f"Parent node not found: {parent_path}"
-                    }
+                    })
             except hou.OperationFailed as e:
-                self.log("error", f"ERROR: Invalid parent path: {parent_path}. Error: {str(e)}")
-                return {
+                self.logger.error(f"ERROR: Invalid parent path: {parent_path}. Error: {str(e)}")
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Invalid parent path: {parent_path}. Error: {str(e)}"
-                }
+                })
                 
             # Create the node
             try:
                 node = parent.createNode(node_type, node_name)
                 node_path = node.path()
+                # Scripts usually wire up a node right after creating it
+                self._cache_node(node_path, node)
                 
-                self.log("info", f"SUCCESS: Node created: {node_path}")
-                return {
+                self.logger.info(f"SUCCESS: Node created: {node_path}")
+                return ValidatedResponse({
                     "status": "success",
                     "message": f"Node created: {node_path}",
                     "node_path": node_path
-                }
+                })
             except hou.OperationFailed as e:
-                self.log("error", f"ERROR: Failed to create node of type {node_type}. Error: {str(e)}")
-                return {
+                self.logger.error(f"ERROR: Failed to create node of type {node_type}. Error: {str(e)}")
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Failed to create node of type {node_type}. Error: {str(e)}"
-                }
+                })
                 
         except Exception as e:
-            self.log("error", f"ERROR: Unexpected error creating node: {str(e)}")
-            traceback.print_exc()
-            return {
+            self.logger.error("ERROR: Unexpected error creating node: %s: %s", type(e).__name__, e)
+            self.logger.debug("create_node failure", exc_info=True)
+            return ValidatedResponse({
                 "status": "error",
-                "message": f"Error creating node: {str(e)}"
-            }
+                "message": f"Error creating node: {str(e)}",
+                "exc_type": type(e).__name__
+            })
     
     def connect_nodes(self, params):
         """Connect two nodes together"""
@@ -217,44 +341,44 @@ class CommandExecutor:
         input_index = params.get("input_index", 0)
         
         if not from_path or not to_path:
-            return {
+            return ValidatedResponse({
                 "status": "error",
                 "message": "Missing required parameters: from_path and to_path"
-            }
+            })
             
         try:
             # Get nodes
-            from_node = hou.node(from_path)
+            from_node = self._resolve_node(from_path)
             if not from_node:
-                return {
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Source node not found: {from_path}"
-                }
+                })
                 
-            to_node = hou.node(to_path)
+            to_node = self._resolve_node(to_path)
             if not to_node:
-                return {
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Target node not found: {to_path}"
-                }
+                })
                 
             # Connect nodes
             to_node.setInput(input_index, from_node)
             
-            return {
+            return ValidatedResponse({
                 "status": "success",
                 "message": f"Connected {from_path} to {to_path} at input {input_index}"
-            }
+            })
         except hou.OperationFailed as e:
-            return {
+            return ValidatedResponse({
                 "status": "error",
                 "message": f"Failed to connect nodes. Error: {str(e)}"
-            }
+            })
         except Exception as e:
-            return {
+            return ValidatedResponse({
                 "status": "error",
                 "message": f"Error connecting nodes: {str(e)}"
-            }
+            })
     
     def set_param(self, params):
         """Set a parameter value on a node"""
@@ -263,19 +387,19 @@ class CommandExecutor:
         param_value = params.get("param_value")
         
         if not node_path or not param_name or param_value is None:
-            return {
+            return ValidatedResponse({
                 "status": "error",
                 "message": "Missing required parameters: node_path, param_name, and param_value"
-            }
+            })
             
         try:
             # Get node
-            node = hou.node(node_path)
+            node = self._resolve_node(node_path)
             if not node:
-                return {
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Node not found: {node_path}"
-                }
+                })
                 
             # Get parameter
             try:
@@ -284,64 +408,97 @@ class CommandExecutor:
                     # Try to get parmTuple
                     parm_tuple = node.parmTuple(param_name)
                     if not parm_tuple:
-                        return {
+                        return ValidatedResponse({
                             "status": "error",
                             "message": f"Parameter not found: {param_name} on {node_path}"
-                        }
+                        })
                     
                     # Handle vector/tuple parameters
                     if isinstance(param_value, list):
                         if len(param_value) != len(parm_tuple):
-                            return {
+                            return ValidatedResponse({
                                 "status": "error",
                                 "message": f"Parameter {param_name} expects {len(parm_tuple)} values, got {len(param_value)}"
-                            }
+                            })
                         
                         for i, val in enumerate(param_value):
                             parm_tuple[i].set(val)
                     else:
-                        return {
+                        return ValidatedResponse({
                             "status": "error",
                             "message": f"Parameter {param_name} is a tuple and requires a list of values"
-                        }
+                        })
                 else:
                     # Handle simple parameters
                     parm.set(param_value)
                 
-                return {
+                return ValidatedResponse({
                     "status": "success",
                     "message": f"Parameter {param_name} set to {param_value} on {node_path}"
-                }
+                })
             except hou.OperationFailed as e:
-                return {
+                return ValidatedResponse({
                     "status": "error",
                     "message": f"Failed to set parameter. Error: {str(e)}"
-                }
+                })
         except Exception as e:
-            return {
+            return ValidatedResponse({
                 "status": "error",
                 "message": f"Error setting parameter: {str(e)}"
-            }
+            })
     
+    def bulk_ops(self, params):
+        """
+        Run a list of commands in one request
+
+        Args:
+            params: Command parameters including:
+                - ops: List of commands, each with 'type' and optional 'params'
+
+        Returns:
+            Dictionary with one result per op, in order
+        """
+        ops = params.get("ops")
+        if not isinstance(ops, list):
+            return ValidatedResponse({
+                "status": "error",
+                "message": "Parameter ops must be a list of commands"
+            })
+
+        results = []
+        # One undo entry for the whole batch instead of one per op
+        with hou.undos.group("MCP bulk"):
+            for op in ops:
+                if not isinstance(op, dict):
+                    results.append({"status": "error", "message": f"Invalid op: {op!r}"})
+                elif op.get("type") == "bulk_ops":
+                    results.append({"status": "error", "message": "bulk_ops cannot be nested"})
+                else:
+                    try:
+                        results.append(self._normalize_response(self._dispatch(op)))
+                    except Exception as e:
+                        results.append({"status": "error", "message": str(e)})
+
+        failed = sum(1 for r in results if r.get("status") == "error")
+        return {
+            "status": "error" if failed else "success",
+            "message": f"{len(results) - failed} of {len(results)} operations succeeded",
+            "results": results
+        }
+
     def get_scene_info(self, params):
         """Get information about the current Houdini scene"""
         try:
             hip_file = hou.hipFile.name()
             fps = hou.fps()
             current_frame = hou.frame()
-            start_frame = hou.playbar.playbackRange()[0]
-            end_frame = hou.playbar.playbackRange()[1]
+            start_frame, end_frame = hou.playbar.playbackRange()
             
             # Get top-level nodes
-            top_nodes = []
-            for context in ["obj", "shop", "mat", "vex", "ch"]:
-                context_node = hou.node(f"/{context}")
-                if context_node:
-                    children = [n.name() for n in context_node.children()]
-                    top_nodes.append({
-                        "context": context,
-                        "nodes": children
-                    })
+            top_nodes = [
+                {"context": context, "nodes": [n.name() for n in context_node.children()]}
+                for context, context_node in self._get_context_nodes()
+            ]
             
             return {
                 "hip_file": hip_file,
@@ -352,11 +509,66 @@ class CommandExecutor:
                 "top_nodes": top_nodes
             }
         except Exception as e:
-            self.log("error", f"Error getting scene info: {str(e)}")
+            self.logger.error(f"Error getting scene info: {str(e)}")
             return {"error": str(e)}
     
-    def get_object_info(self, object_name):
-        """Get detailed information about a specified node"""
+    def _resolve_node(self, path):
+        """
+        Look up a node by path, reusing the node found by an earlier lookup
+        as long as it still exists under the same path
+        """
+        node = self._node_cache.get(path)
+        if node is not None:
+            try:
+                if node.path() == path:
+                    self._node_cache.move_to_end(path)
+                    return node
+            except hou.ObjectWasDeleted:
+                pass
+        node = hou.node(path)
+        if node:
+            self._cache_node(path, node)
+        else:
+            self._node_cache.pop(path, None)
+        return node
+    
+    def _cache_node(self, path, node):
+        """Remember a node lookup, evicting the least recently used entry when full"""
+        self._node_cache[path] = node
+        self._node_cache.move_to_end(path)
+        if len(self._node_cache) > NODE_CACHE_SIZE:
+            self._node_cache.popitem(last=False)
+    
+    def _on_hip_file_event(self, event_type):
+        """Drop cached nodes when the scene is replaced"""
+        if event_type in (hou.hipFileEventType.AfterClear, hou.hipFileEventType.AfterLoad):
+            self._node_cache.clear()
+    
+    def _get_context_nodes(self):
+        """
+        Get the (name, node) pairs of the top-level contexts that exist in this session.
+        Context nodes live for the whole session, so they are only resolved once.
+        """
+        if self._context_nodes is None:
+            context_nodes = [(c, hou.node(f"/{c}")) for c in ("obj", "shop", "mat", "vex", "ch")]
+            self._context_nodes = [(c, n) for c, n in context_nodes if n]
+        return self._context_nodes
+    
+    def get_object_info(self, params):
+        """
+        Get detailed information about a specified node
+        
+        Args:
+            params: Command parameters including:
+                - object_name: Path to the node (node_path is accepted as well)
+                - parameter_layout: "columns" (default) for parallel name/value
+                  lists, or "dict" for a name -> value mapping
+                - include_hidden: Also report parameters hidden in the UI (default False)
+                
+        Returns:
+            Dictionary with the node's type, hierarchy, parameters and connections
+        """
+        object_name = params.get("object_name") or params.get("node_path")
         if not object_name:
             return {"error": "No object name specified"}
             
@@ -376,13 +588,32 @@ class CommandExecutor:
             # Get children
             children = [c.path() for c in node.children()]
             
-            # Get parameters
-            parameters = {}
-            for parm in node.parms():
-                try:
-                    parameters[parm.name()] = parm.eval()
-                except:
-                    parameters[parm.name()] = str(parm)
+            # Get parameters - evaluate whole parm tuples so vector parms (t, r, s, colors)
+            # cost a single HOM call instead of one per component
+            parm_tuples = node.parmTuples()
+            if not params.get("include_hidden", False):
+                # Hidden parms are mostly solver internals; skipping them avoids their
+                # evaluation and shrinks the response considerably on heavy nodes
+                parm_tuples = [pt for pt in parm_tuples if not pt.isHidden()]
+            names = [pt.name() for pt in parm_tuples]
+            try:
+                values = [self._eval_parm_tuple(pt) for pt in parm_tuples]
+            except Exception:
+                # Some parm failed to evaluate (e.g. a broken channel reference),
+                # so redo the pass guarding each tuple individually
+                values = [None] * len(parm_tuples)
+                for i, parm_tuple in enumerate(parm_tuples):
+                    try:
+                        values[i] = self._eval_parm_tuple(parm_tuple)
+                    except Exception:
+                        values[i] = str(parm_tuple)
+            
+            # Parameters are sent as parallel name/value columns by default, which is
+            # much denser JSON for parm-heavy nodes; "dict" keeps the name -> value mapping
+            if params.get("parameter_layout") == "dict":
+                parameters = dict(zip(names, values))
+            else:
+                parameters = {"names": names, "values": values}
                     
             # Get inputs and outputs
             inputs = []
@@ -412,28 +643,35 @@ class CommandExecutor:
                 "outputs": outputs
             }
         except Exception as e:
-            self.log("error", f"Error getting object info: {str(e)}")
+            self.logger.error(f"Error getting object info: {str(e)}")
             return {"error": str(e)}
             
-    # Simulation methods will be imported from simulations.py
+    def _eval_parm_tuple(self, parm_tuple):
+        """Evaluate a parm tuple with the typed evaluator matching its data type"""
+        evaluator = self._parm_evaluators.get(parm_tuple.parmTemplate().dataType())
+        if evaluator is None:
+            # Ramp and data parms have no plain value
+            return str(parm_tuple)
+        values = evaluator(parm_tuple)
+        return values[0] if len(values) == 1 else list(values)
+            
+    # Simulation methods are implemented in simulations.py
     def create_fluid_sim(self, params):
         """Create a FLIP fluid simulation with specified parameters"""
-        from simulations import create_fluid_simulation
         return create_fluid_simulation(params, self.logger)
     
     def create_pyro_sim(self, params):
         """Create a Pyro simulation (fire/smoke) with specified parameters"""
-        from simulations import create_pyro_simulation
         return create_pyro_simulation(params, self.logger)
     
     def run_simulation(self, params):
         """Run a simulation from specified frames"""
-        from simulations import run_simulation
-        return run_simulation(params, self.logger)
+        return _run_simulation(params, self.logger)
     
     # Code execution
-    def execute_houdini_code(self, code):
+    def execute_houdini_code(self, params):
         """Execute arbitrary Python code in Houdini"""
+        code = params.get("code") if isinstance(params, dict) else params
         if not code:
             return {
                 "status": "error",
@@ -447,18 +685,22 @@ class CommandExecutor:
                 "hou": hou
             }
             
-            # Execute the code
-            exec(code, global_dict, local_dict)
+            # Execute the code, reusing the compiled code object for repeated snippets
+            exec(_compile_code(code), global_dict, local_dict)
             
             # Return results if any
             return {
                 "status": "success",
                 "message": "Code executed successfully",
-                "variables": {k: str(v) for k, v in local_dict.items() if not k.startswith("_")}
+                "variables": {k: _describe_variable(v) for k, v in local_dict.items() if k[:1] != "_"}
             }
         except Exception as e:
-            traceback.print_exc()
+            # Failing snippets are routine while exploring a scene; only format the
+            # traceback when debug logging is on
+            self.logger.error("Error executing code: %s: %s", type(e).__name__, e)
+            self.logger.debug("execute_houdini_code failure", exc_info=True)
             return {
                 "status": "error",
-                "message": f"Error executing code: {str(e)}"
+                "message": f"Error executing code: {str(e)}",
+                "exc_type": type(e).__name__
             } 
\ No newline at end of file
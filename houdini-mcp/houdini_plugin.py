@@ -1,61 +1,285 @@
+"""
+HoudiniMCP plugin: socket server that runs MCP commands inside Houdini.
+
+Requires Python 3.7 or newer (the interpreter bundled with Houdini 18.0+).
+"""
 import hou
+import collections
 import json
 import threading
 import socket
-import time
-import traceback
+import selectors
+import struct
+import logging
 import os
-import tempfile
-from typing import Dict, Any, List, Optional
-import math
+import re
+import queue
+import fnmatch
+import functools
+import itertools
+
+def _json_default(obj):
+    """Encode HOM values JSON has no type for: matrices and vectors as nested tuples, anything else as str"""
+    if hasattr(obj, "asTupleOfTuples"):
+        return obj.asTupleOfTuples()
+    try:
+        # hou.Vector2/3/4, hou.Quaternion, hou.Color-like sequences
+        return tuple(obj)
+    except TypeError:
+        return str(obj)
+
+try:
+    import orjson
+    # orjson returns UTF-8 bytes directly in a single C pass, and parses straight
+    # from a memoryview of the receive buffer
+    def _dumps(obj):
+        return orjson.dumps(obj, default=_json_default)
+    _loads = orjson.loads
+except ImportError:
+    _encode = json.JSONEncoder(separators=(",", ":"), default=_json_default).encode
+    def _dumps(obj):
+        return _encode(obj).encode('utf-8')
+    def _loads(data):
+        return json.loads(bytes(data))
+
+try:
+    import numba
+    # Exposed to execute_houdini_code snippets, which run with this module's globals:
+    # decorate numeric point-processing loops with @njit to compile them natively
+    njit = numba.njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, so snippets using @njit still run without numba"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # Metadata cho plugin
 PLUGIN_NAME = "HoudiniMCP"
 PLUGIN_VERSION = "1.0.0"
 PLUGIN_DESCRIPTION = "Connect Houdini to Claude via MCP"
 
+# Tracebacks are only formatted at DEBUG level; the default WARNING level skips
+# the stack walk on the error path
+logger = logging.getLogger("HoudiniMCP.Plugin")
+
+# Wire format: each message is a 4-byte big-endian length followed by that many
+# bytes of UTF-8 JSON. Messages starting with "{" are unframed JSON from older
+# clients and are answered unframed.
+_HEADER = struct.Struct(">I")
+# sendmsg (writev) is unavailable on Windows
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+_LEGACY_MESSAGE_START = ord("{")
+# Selector data marking the wake-up socket
+_WAKE = "wake"
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+_WHITESPACE = b" \t\r\n"
+# Initial capacity of each client's receive buffer; it doubles when a message outgrows it
+_RECV_BUFFER_SIZE = 64 * 1024
+# Kernel send/receive buffer size requested for the listener and each client
+SOCKET_BUFFER_SIZE = 1 << 20
+# Most node paths kept by the lookup cache
+NODE_CACHE_SIZE = 256
+# Parm data types get_object_info reports as strings instead of evaluating
+_OPAQUE_PARM_DATA = frozenset({hou.parmData.Ramp, hou.parmData.Data})
+# Buffers passed to one sendmsg call, well under IOV_MAX on every platform
+_MAX_IOV = 64
+
+@functools.lru_cache(maxsize=128)
+def _compile_code(code):
+    """Compile a code snippet for execute_houdini_code, caching the result per source string"""
+    return compile(code, "<mcp>", "exec")
+
+class BufferPool:
+    """Reusable receive buffers, so connection churn does not hit the allocator"""
+    def __init__(self, count, size):
+        self.size = size
+        self.max_free = count
+        self.free = collections.deque(bytearray(size) for _ in range(count))
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Return a free buffer, allocating a new one if the pool is empty"""
+        with self.lock:
+            if self.free:
+                return self.free.popleft()
+        return bytearray(self.size)
+    
+    def release(self, buf):
+        """Return a buffer to the pool; buffers that grew past the pool size are dropped"""
+        if len(buf) != self.size:
+            return
+        with self.lock:
+            if len(self.free) < self.max_free:
+                self.free.append(buf)
+
+RECV_BUFFER_POOL = BufferPool(4, _RECV_BUFFER_SIZE)
+
+# Bytes that matter for finding where an unframed JSON message ends; UTF-8
+# continuation bytes never match these, so the scan works on raw bytes
+_JSON_STRUCTURE = re.compile(rb'[{}\[\]"\\]')
+_JSON_OPENERS = b"{["
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+def _scan_json(buf, i, end, depth, in_string):
+    """
+    Advance a bracket counter over buf[i:end], skipping string contents.
+    Returns (i, depth, in_string); depth 0 means the value is complete and ends at i.
+    """
+    search = _JSON_STRUCTURE.search
+    while True:
+        match = search(buf, i, end)
+        if match is None:
+            # i can be past end when an escape's second byte hasn't arrived yet
+            return max(i, end), depth, in_string
+        c = buf[match.start()]
+        i = match.start() + 1
+        if in_string:
+            if c == _BACKSLASH:
+                i += 1
+            elif c == _QUOTE:
+                in_string = False
+        elif c == _QUOTE:
+            in_string = True
+        elif c in _JSON_OPENERS:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return i, 0, False
+
+def _pin_current_thread():
+    """
+    Pin the calling thread to the CPU named by HOUDINI_MCP_CPU ("last" for the
+    highest-numbered core), keeping the receive buffers in one core's cache.
+    Unset leaves scheduling to the OS; a no-op where sched_setaffinity is missing.
+    """
+    cpu = os.environ.get("HOUDINI_MCP_CPU")
+    if not cpu or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cpu = os.cpu_count() - 1 if cpu == "last" else int(cpu)
+        # pid 0 is the calling thread on Linux
+        os.sched_setaffinity(0, {cpu})
+    except (ValueError, OSError) as e:
+        logger.warning("Could not pin server thread to CPU %s: %s", cpu, e)
+
 class HoudiniMCPServer:
-    def __init__(self, host='localhost', port=9876):
+    # Command type -> handler(self, params), looked up once per command
+    _HANDLERS = {
+        # Scene information commands
+        "get_scene_info": lambda self, params: self.get_scene_info(),
+        "get_object_info": lambda self, params: self.get_object_info(params.get("object_name"), params.get("parm_filter")),
+        
+        # Object manipulation commands
+        "create_object": lambda self, params: self.create_object(params),
+        "modify_object": lambda self, params: self.modify_object(params),
+        "delete_object": lambda self, params: self.delete_object(params.get("name")),
+        
+        # Material commands
+        "set_material": lambda self, params: self.set_material(params),
+        
+        # Simulation specific commands
+        "create_fluid_simulation": lambda self, params: self.create_fluid_simulation(params),
+        "create_pyro_simulation": lambda self, params: self.create_pyro_simulation(params),
+        "simulate": lambda self, params: self.simulate(params),
+        
+        # Code execution
+        "execute_houdini_code": lambda self, params: self.execute_houdini_code(params.get("code", "")),
+    }
+    
+    # Commands that only inspect the scene and may run on the server thread
+    READ_ONLY_COMMANDS = frozenset({"get_scene_info", "get_object_info"})
+    
+    def __init__(self, host='localhost', port=9876, socket_buffer_size=SOCKET_BUFFER_SIZE):
         self.host = host
         self.port = port
-        self.running = False
+        # SO_RCVBUF/SO_SNDBUF request; None keeps the OS defaults (e.g. on low-memory systems)
+        self.socket_buffer_size = socket_buffer_size
+        # Event rather than a bare bool so start/stop are signalled explicitly to the server threads
+        self._running = threading.Event()
+        self._lifecycle_lock = threading.Lock()
         self.socket = None
+        self.selector = None
+        self._wake_r = None
+        self._wake_w = None
         self.server_thread = None
+        self._node_cache = collections.OrderedDict()
+        # Read-only commands use the cache from the server thread while the main
+        # thread runs the rest; held only around dict operations, never across HOM calls
+        self._node_cache_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        # Commands waiting for the main thread, and whether a drain is already posted
+        self._posted = collections.deque()
+        self._drain_scheduled = False
+        # Responses from the main thread, queued for the server thread to send
+        self._outbox = queue.SimpleQueue()
+    
+    @property
+    def running(self):
+        return self._running.is_set()
+    
+    def is_running(self):
+        """Return True while the server is accepting connections"""
+        return self._running.is_set()
     
     def start(self):
-        if self.running:
-            print("Server is already running")
-            return
-            
-        self.running = True
+        with self._lifecycle_lock:
+            if self._running.is_set():
+                logger.warning("Server is already running")
+                return
+            self._running.set()
         
         try:
             # Create socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Set before listen() so accepted sockets start with the larger window
+            self._tune_socket(self.socket)
             self.socket.bind((self.host, self.port))
-            self.socket.listen(1)
+            # The MCP server and the REST proxy's pool can connect at the same time
+            self.socket.listen(socket.SOMAXCONN)
+            self.socket.setblocking(False)
+            
+            # One selector multiplexes the listening socket and every client, so
+            # idle connections don't each hold a thread
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.socket, selectors.EVENT_READ, None)
+            
+            # stop() and the main thread write to this pair to wake the selector, so it
+            # can block without a timeout; both ends are non-blocking so a full pair
+            # never stalls the main thread (a byte already queued wakes the loop anyway)
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+            self.selector.register(self._wake_r, selectors.EVENT_READ, _WAKE)
+            
+            hou.hipFile.addEventCallback(self._on_hip_file_event)
+            self._warm_up()
             
             # Start server thread
             self.server_thread = threading.Thread(target=self._server_loop)
             self.server_thread.daemon = True
             self.server_thread.start()
             
-            print(f"HoudiniMCP server started on {self.host}:{self.port}")
+            logger.info("HoudiniMCP server started on %s:%s", self.host, self.port)
         except Exception as e:
-            print(f"Failed to start server: {str(e)}")
+            logger.error("Failed to start server: %s", e)
             self.stop()
             
     def stop(self):
-        self.running = False
+        self._running.clear()
         
-        # Close socket
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
+        try:
+            hou.hipFile.removeEventCallback(self._on_hip_file_event)
+        except hou.OperationFailed:
+            pass
+        with self._node_cache_lock:
+            self._node_cache.clear()
+        
+        # Wake the selector so the server loop sees the cleared flag immediately
+        self._wake()
         
         # Wait for thread to finish
         if self.server_thread:
@@ -66,100 +290,296 @@ class HoudiniMCPServer:
                 pass
             self.server_thread = None
         
-        print("HoudiniMCP server stopped")
+        # Close sockets; take them under the lock so concurrent stop() calls close them once
+        with self._lifecycle_lock:
+            sockets = (self.socket, self._wake_r, self._wake_w)
+            self.socket = self._wake_r = self._wake_w = None
+        for sock in sockets:
+            if sock:
+                try:
+                    sock.close()
+                except:
+                    pass
+        
+        logger.info("HoudiniMCP server stopped")
+    
+    def _wake(self):
+        """Interrupt the selector from another thread"""
+        wake_w = self._wake_w
+        if wake_w:
+            try:
+                wake_w.send(b"x")
+            except OSError:
+                pass
     
     def _server_loop(self):
-        """Main server loop in a separate thread"""
-        print("Server thread started")
-        self.socket.settimeout(1.0)  # Timeout to allow for stopping
+        """Main server loop in a separate thread - only does socket I/O and JSON parsing"""
+        logger.debug("Server thread started")
+        _pin_current_thread()
+        selector = self.selector
         
-        while self.running:
-            try:
-                # Accept new connection
+        try:
+            while self.running:
                 try:
-                    client, address = self.socket.accept()
-                    print(f"Connected to client: {address}")
-                    
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                except socket.timeout:
-                    # Just check running condition
-                    continue
-                except Exception as e:
-                    print(f"Error accepting connection: {str(e)}")
-                    time.sleep(0.5)
-            except Exception as e:
-                print(f"Error in server loop: {str(e)}")
-                if not self.running:
+                    # Blocks until a socket is ready or stop() writes to the wake pair
+                    events = selector.select()
+                except (OSError, ValueError):
                     break
-                time.sleep(0.5)
+                
+                for key, mask in events:
+                    if key.data is None:
+                        self._accept_client()
+                    elif key.data is _WAKE:
+                        # Loop condition re-checks the running flag
+                        self._drain_outbox()
+                    else:
+                        if mask & selectors.EVENT_WRITE:
+                            self._flush_client(key.fileobj, key.data)
+                        if mask & selectors.EVENT_READ and not key.data["closed"]:
+                            self._read_client(key.fileobj, key.data)
+        except Exception as e:
+            logger.error("Error in server loop: %s", e)
+        finally:
+            # Close any clients still connected
+            for key in list(selector.get_map().values()):
+                if isinstance(key.data, dict):
+                    self._close_client(key.fileobj)
+            selector.close()
         
-        print("Server thread stopped")
+        logger.debug("Server thread stopped")
     
-    def _handle_client(self, client):
-        """Handle connected client"""
-        print("Client handler started")
-        client.settimeout(None)  # No timeout
-        buffer = b''
+    def _accept_client(self):
+        """Accept a pending connection and register it with the selector"""
+        try:
+            client, address = self.socket.accept()
+        except (BlockingIOError, AttributeError, OSError):
+            return
+        logger.info("Connected to client: %s", address)
+        
+        # Only this thread touches the socket: reads and writes are both driven by
+        # the selector, so a slow reader can't stall other clients or the main thread
+        client.setblocking(False)
+        self._tune_socket(client)
+        # "scan"/"depth"/"in_string" track _scan_json through a partial unframed message,
+        # with "scan" relative to the message start
+        state = {"buf": RECV_BUFFER_POOL.acquire(), "end": 0, "pending": 0,
+                 "out": collections.deque(), "writing": False, "closed": False,
+                 "scan": 0, "depth": 0, "in_string": False}
+        self.selector.register(client, selectors.EVENT_READ, state)
+    
+    def _tune_socket(self, sock):
+        """Disable Nagle's algorithm and enlarge the socket buffers for request/response traffic"""
+        try:
+            # Small responses would otherwise wait up to 40 ms for a delayed ACK
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.socket_buffer_size:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+        except OSError as e:
+            logger.warning("Could not tune socket options: %s", e)
+    
+    def _close_client(self, client):
+        """Unregister and close a client connection"""
+        try:
+            key = self.selector.unregister(client)
+            key.data["closed"] = True
+            key.data["out"].clear()
+            RECV_BUFFER_POOL.release(key.data["buf"])
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.close()
+        except:
+            pass
+        logger.info("Client disconnected")
+    
+    def _read_client(self, client, state):
+        """Read available data from a client and dispatch every complete command"""
+        buf = state["buf"]
+        end = state["end"]
+        if end == len(buf):
+            if end >= _HEADER.size + MAX_MESSAGE_SIZE:
+                self._reject_oversized(client, end)
+                return
+            # Full without a complete message: double the capacity (amortized O(1) appends)
+            buf.extend(bytes(len(buf)))
         
         try:
-            while self.running:
-                # Receive data
+            n = client.recv_into(memoryview(buf)[end:])
+        except BlockingIOError:
+            return
+        except Exception as e:
+            logger.warning("Error receiving data: %s", e)
+            n = 0
+        if not n:
+            self._close_client(client)
+            return
+        end += n
+        
+        # The buffer can hold several pipelined commands; each iteration consumes one
+        pos = 0
+        while True:
+            # Skip whitespace between legacy commands (a valid frame header never
+            # starts with a whitespace byte because of MAX_MESSAGE_SIZE)
+            while pos < end and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos == end:
+                break
+            
+            if buf[pos] == _LEGACY_MESSAGE_START:
+                # Unframed JSON from older clients: scan only the new bytes for the
+                # closing brace, and parse once when the message is complete
+                framed = False
+                scan, depth, in_string = _scan_json(buf, pos + state["scan"], end, state["depth"], state["in_string"])
+                if depth:
+                    # Incomplete data, wait for more
+                    state["scan"], state["depth"], state["in_string"] = scan - pos, depth, in_string
+                    break
+                state["scan"], state["depth"], state["in_string"] = 0, 0, False
+                body_start, pos = pos, scan
                 try:
-                    data = client.recv(8192)
-                    if not data:
-                        print("Client disconnected")
-                        break
-                    
-                    buffer += data
-                    try:
-                        # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
-                        
-                        # Execute command in Houdini's main thread
-                        def execute_wrapper():
-                            try:
-                                response = self.execute_command(command)
-                                response_json = json.dumps(response)
-                                try:
-                                    client.sendall(response_json.encode('utf-8'))
-                                except:
-                                    print("Failed to send response - client disconnected")
-                            except Exception as e:
-                                print(f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    client.sendall(json.dumps(error_response).encode('utf-8'))
-                                except:
-                                    pass
-                            return None
-                        
-                        # Schedule execution in main thread using Houdini's event loop
-                        hou.ui.postEvent(execute_wrapper)
-                    except json.JSONDecodeError:
-                        # Incomplete data, wait for more
-                        pass
-                except Exception as e:
-                    print(f"Error receiving data: {str(e)}")
+                    command = _loads(memoryview(buf)[body_start:pos])
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    self._queue_response(client, state, {"status": "error", "message": f"Invalid JSON received: {str(e)}"}, False)
+                    continue
+            else:
+                # Length-prefixed frame: parse exactly once, when the whole body is here
+                framed = True
+                if end - pos < _HEADER.size:
                     break
+                (length,) = _HEADER.unpack_from(buf, pos)
+                if length > MAX_MESSAGE_SIZE:
+                    self._reject_oversized(client, length)
+                    return
+                body_start = pos + _HEADER.size
+                if end - body_start < length:
+                    if body_start + length > len(buf):
+                        # Grow once to fit the announced frame instead of doubling repeatedly
+                        buf.extend(bytes(body_start + length - len(buf)))
+                    break
+                pos = body_start + length
+                try:
+                    # Parse the frame in place; orjson reads the view without copying the body
+                    command = _loads(memoryview(buf)[body_start:pos])
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    self._queue_response(client, state, {"status": "error", "message": f"Invalid JSON received: {str(e)}"}, True)
+                    continue
+            
+            if (isinstance(command, dict) and command.get("type") in self.READ_ONLY_COMMANDS
+                    and not state["pending"]):
+                # Read-only queries don't need the main-thread hop; HOM serializes
+                # calls from this thread itself. Only taken when no earlier command
+                # from this client is still queued, so responses stay in order.
+                self._queue_response(client, state, self.execute_command(command), framed)
+            else:
+                # Queue for the main thread; one posted drain handles a whole burst of
+                # commands, so the Houdini event loop isn't woken once per command
+                with self._pending_lock:
+                    state["pending"] += 1
+                    self._posted.append((client, state, command, framed))
+                    schedule = not self._drain_scheduled
+                    self._drain_scheduled = True
+                if schedule:
+                    hou.ui.postEvent(self._drain_posted)
+        
+        # Move any partial message to the front of the buffer
+        if pos:
+            buf[:end - pos] = buf[pos:end]
+            end -= pos
+        state["end"] = end
+    
+    def _reject_oversized(self, client, size):
+        """Answer a message that exceeds MAX_MESSAGE_SIZE and drop the client"""
+        logger.warning("Rejecting oversized message (%d bytes)", size)
+        payload = _dumps({"status": "error", "message": f"Message too large: {size} bytes"})
+        try:
+            # Best effort: the client is closed right after, so nothing is queued
+            client.send(_HEADER.pack(len(payload)) + payload)
+        except OSError:
+            pass
+        self._close_client(client)
+    
+    def _queue_response(self, client, state, response, framed):
+        """Serialize a response in the command's framing and queue it for the client"""
+        try:
+            payload = _dumps(response)
         except Exception as e:
-            print(f"Error in client handler: {str(e)}")
-        finally:
-            try:
-                client.close()
-            except:
+            logger.error("Error encoding response: %s: %s", type(e).__name__, e)
+            logger.debug("Response encoding failure", exc_info=True)
+            payload = _dumps({"status": "error", "message": f"{type(e).__name__}: {e}"})
+        out = state["out"]
+        if framed:
+            out.append(memoryview(_HEADER.pack(len(payload))))
+        out.append(memoryview(payload))
+        self._flush_client(client, state)
+    
+    def _flush_client(self, client, state):
+        """Send as much queued output as the socket accepts; wait for EVENT_WRITE for the rest"""
+        out = state["out"]
+        try:
+            while out:
+                if _HAS_SENDMSG:
+                    # Scatter-gather: queued headers and bodies go out in one syscall
+                    sent = client.sendmsg(itertools.islice(out, _MAX_IOV))
+                else:
+                    sent = client.send(out[0])
+                # Drop fully sent buffers and slice the partially sent one
+                while sent:
+                    head = out[0]
+                    if len(head) <= sent:
+                        sent -= len(head)
+                        out.popleft()
+                    else:
+                        out[0] = head[sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            logger.warning("Failed to send response - client disconnected")
+            self._close_client(client)
+            return
+        
+        writing = bool(out)
+        if writing != state["writing"]:
+            state["writing"] = writing
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE if writing else selectors.EVENT_READ
+            self.selector.modify(client, events, state)
+    
+    def _drain_posted(self):
+        """Run every queued command on the main thread, until the queue is empty"""
+        while True:
+            with self._pending_lock:
+                if not self._posted:
+                    # Cleared under the lock so a command queued now schedules a new drain
+                    self._drain_scheduled = False
+                    return
+                item = self._posted.popleft()
+            self._run_posted(*item)
+    
+    def _run_posted(self, client, state, command, framed):
+        """Run a command posted to the main thread and hand the response to the server thread"""
+        self._outbox.put((client, state, self.execute_command(command), framed))
+        self._wake()
+    
+    def _drain_outbox(self):
+        """Queue responses produced on the main thread; runs on the server thread"""
+        try:
+            while self._wake_r.recv(4096):
                 pass
-            print("Client handler stopped")
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            return
+        
+        while True:
+            try:
+                client, state, response, framed = self._outbox.get_nowait()
+            except queue.Empty:
+                return
+            with self._pending_lock:
+                state["pending"] -= 1
+            if not state["closed"]:
+                self._queue_response(client, state, response, framed)
 
     def execute_command(self, command):
         """Execute a command in the main Houdini thread"""
@@ -167,90 +587,112 @@ class HoudiniMCPServer:
             # This function is already being called in the main thread via postEvent
             return self._execute_command_internal(command)
         except Exception as e:
-            print(f"Error executing command: {str(e)}")
-            traceback.print_exc()
-            return {"status": "error", "message": str(e)}
+            logger.error("Error executing command: %s: %s", type(e).__name__, e)
+            logger.debug("Command failure", exc_info=True)
+            return {"status": "error", "message": f"{type(e).__name__}: {e}", "exc_type": type(e).__name__}
 
     def _execute_command_internal(self, command):
         """Internal command execution with proper context"""
         cmd_type = command.get("type")
         params = command.get("params", {})
 
-        # Scene information commands
-        if cmd_type == "get_scene_info":
-            return {"status": "success", "result": self.get_scene_info()}
-        elif cmd_type == "get_object_info":
-            return {"status": "success", "result": self.get_object_info(params.get("object_name"))}
-            
-        # Object manipulation commands
-        elif cmd_type == "create_object":
-            result = self.create_object(params)
-            return {"status": "success", "result": result}
-        elif cmd_type == "modify_object":
-            result = self.modify_object(params)
-            return {"status": "success", "result": result}
-        elif cmd_type == "delete_object":
-            result = self.delete_object(params.get("name"))
-            return {"status": "success", "result": result}
-            
-        # Material commands
-        elif cmd_type == "set_material":
-            result = self.set_material(params)
-            return {"status": "success", "result": result}
-            
-        # Simulation specific commands
-        elif cmd_type == "create_fluid_simulation":
-            result = self.create_fluid_simulation(params)
-            return {"status": "success", "result": result}
-        elif cmd_type == "create_pyro_simulation":
-            result = self.create_pyro_simulation(params)
-            return {"status": "success", "result": result}
-        elif cmd_type == "simulate":
-            result = self.simulate(params)
-            return {"status": "success", "result": result}
-            
-        # Code execution
-        elif cmd_type == "execute_houdini_code":
-            result = self.execute_houdini_code(params.get("code", ""))
-            return {"status": "success", "result": result}
-            
-        else:
+        handler = self._HANDLERS.get(cmd_type)
+        if handler is None:
             return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
+        return {"status": "success", "result": handler(self, params)}
 
+    def _resolve_node(self, path):
+        """Find a node by path, or by name under /obj, reusing earlier lookups while the node still exists there"""
+        # Bare names always mean /obj children, so canonicalize up front and call hou.node once
+        if not path.startswith("/"):
+            path = f"/obj/{path}"
+        with self._node_cache_lock:
+            node = self._node_cache.get(path)
+        if node is not None:
+            try:
+                if node.path() == path:
+                    with self._node_cache_lock:
+                        # Another thread may have dropped the entry during node.path()
+                        if path in self._node_cache:
+                            self._node_cache.move_to_end(path)
+                    return node
+            except hou.ObjectWasDeleted:
+                pass
+        node = hou.node(path)
+        if node:
+            self._cache_node(path, node)
+        else:
+            with self._node_cache_lock:
+                self._node_cache.pop(path, None)
+        return node
+    
+    def _cache_node(self, path, node):
+        """Remember a node lookup, evicting the least recently used entry when full"""
+        with self._node_cache_lock:
+            self._node_cache[path] = node
+            self._node_cache.move_to_end(path)
+            if len(self._node_cache) > NODE_CACHE_SIZE:
+                self._node_cache.popitem(last=False)
+    
+    def _warm_up(self):
+        """Touch the HOM calls handlers use so their first real use doesn't pay the lazy-load cost"""
+        try:
+            # Also primes the node cache with the context nodes every handler starts from
+            self._resolve_node("/obj")
+            self._resolve_node("/mat")
+            hou.playbar.playbackRange()
+            hou.fps()
+            hou.frame()
+            hou.hipFile.path()
+        except Exception as e:
+            logger.debug("HOM warm-up skipped: %s", e)
+    
+    def _set_parms(self, node, values):
+        """Set several parameters with one setParms call, skipping names the node doesn't have"""
+        values = {name: value for name, value in values.items() if node.parm(name) is not None}
+        if values:
+            node.setParms(values)
+    
+    def _on_hip_file_event(self, event_type):
+        """Drop cached nodes when the scene is replaced"""
+        if event_type in (hou.hipFileEventType.AfterClear, hou.hipFileEventType.AfterLoad):
+            with self._node_cache_lock:
+                self._node_cache.clear()
+    
     # Scene information methods
     def get_scene_info(self):
         """Get general information about the current Houdini scene"""
+        start_frame, end_frame = hou.playbar.playbackRange()
         result = {
             "hip_file": hou.hipFile.path(),
             "hip_name": hou.hipFile.basename(),
             "frame_rate": hou.fps(),
             "current_frame": hou.frame(),
-            "start_frame": hou.playbar.playbackRange()[0],
-            "end_frame": hou.playbar.playbackRange()[1],
-            "objects": []
+            "start_frame": start_frame,
+            "end_frame": end_frame,
         }
         
-        # List top-level objects
-        for node in hou.node("/obj").children():
-            result["objects"].append({
-                "name": node.name(),
-                "type": node.type().name(),
-                "path": node.path()
-            })
+        # List top-level objects as parallel columns rather than one dict per node
+        nodes = self._resolve_node("/obj").children()
+        result["objects"] = {
+            "names": [node.name() for node in nodes],
+            "types": [node.type().name() for node in nodes],
+            "paths": [node.path() for node in nodes]
+        }
         
         return result
     
-    def get_object_info(self, object_name):
-        """Get detailed information about a specific node"""
+    def get_object_info(self, object_name, parm_filter=None):
+        """Get detailed information about a specific node
+        
+        parm_filter is an optional glob pattern or list of parameter names; only
+        matching parameter tuples are evaluated.
+        """
         if not object_name:
             return {"error": "No object name provided"}
         
         # Try to find the node
-        node = hou.node(object_name)
-        if not node:
-            # Try with /obj/ prefix if not specified
-            if not object_name.startswith("/"):
-                node = hou.node(f"/obj/{object_name}")
+        node = self._resolve_node(object_name)
         
         if not node:
             return {"error": f"Node '{object_name}' not found"}
@@ -265,11 +707,29 @@ class HoudiniMCPServer:
             "parameters": {}
         }
         
-        # Add parameter information
-        for parm in node.parms():
-            result["parameters"][parm.name()] = {
-                "value": parm.eval(),
-                "type": parm.parmTemplate().type().name()
+        # Work per parameter tuple (one t instead of tx/ty/tz) and skip filtered-out
+        # tuples before evaluating, since each eval is a call into Houdini
+        tuples = node.parmTuples()
+        if parm_filter:
+            if isinstance(parm_filter, str):
+                tuples = [t for t in tuples if fnmatch.fnmatchcase(t.name(), parm_filter)]
+            else:
+                wanted = set(parm_filter)
+                tuples = [t for t in tuples if t.name() in wanted]
+        
+        parameters = result["parameters"]
+        for parm_tuple in tuples:
+            template = parm_tuple.parmTemplate()
+            if template.dataType() in _OPAQUE_PARM_DATA:
+                # Ramps and geometry data parms have no JSON form; don't evaluate them at all
+                value = str(parm_tuple)
+            else:
+                value = parm_tuple.eval()
+                if len(value) == 1:
+                    value = value[0]
+            parameters[parm_tuple.name()] = {
+                "value": value,
+                "type": template.type().name()
             }
         
         return result
@@ -285,11 +745,13 @@ class HoudiniMCPServer:
         
         # Create the node
         parent_path = params.get("parent_path", "/obj")
-        parent = hou.node(parent_path)
+        parent = self._resolve_node(parent_path)
         if not parent:
             return {"error": f"Parent node '{parent_path}' not found"}
         
         node = parent.createNode(obj_type, name)
+        # Follow-up modify/set_material calls usually target the node just created
+        self._cache_node(node.path(), node)
         
         # Process additional parameters based on object type
         if obj_type == "geo":
@@ -300,11 +762,7 @@ class HoudiniMCPServer:
                 sop = node.createNode(sop_type, sop_name)
                 
                 # Set SOP parameters if provided
-                sop_params = params.get("sop_params", {})
-                for param_name, param_value in sop_params.items():
-                    parm = sop.parm(param_name)
-                    if parm:
-                        parm.set(param_value)
+                self._set_parms(sop, params.get("sop_params", {}))
                 
                 # Make display node
                 sop.setDisplayFlag(True)
@@ -316,11 +774,7 @@ class HoudiniMCPServer:
             node.setPosition([float(position[0]), float(position[1])])
         
         # Set parameters if provided
-        node_params = params.get("parameters", {})
-        for param_name, param_value in node_params.items():
-            parm = node.parm(param_name)
-            if parm:
-                parm.set(param_value)
+        self._set_parms(node, params.get("parameters", {}))
         
         return {
             "name": node.name(),
@@ -333,21 +787,13 @@ class HoudiniMCPServer:
         if not node_path:
             return {"error": "No node path provided"}
         
-        node = hou.node(node_path)
-        if not node:
-            # Try with /obj/ prefix if not specified
-            if not node_path.startswith("/"):
-                node = hou.node(f"/obj/{node_path}")
+        node = self._resolve_node(node_path)
         
         if not node:
             return {"error": f"Node '{node_path}' not found"}
         
         # Update parameters
-        node_params = params.get("parameters", {})
-        for param_name, param_value in node_params.items():
-            parm = node.parm(param_name)
-            if parm:
-                parm.set(param_value)
+        self._set_parms(node, params.get("parameters", {}))
         
         # Move node if position specified
         position = params.get("position")
@@ -364,15 +810,14 @@ class HoudiniMCPServer:
         if not node_path:
             return {"error": "No node path provided"}
         
-        node = hou.node(node_path)
-        if not node:
-            # Try with /obj/ prefix if not specified
-            if not node_path.startswith("/"):
-                node = hou.node(f"/obj/{node_path}")
+        node = self._resolve_node(node_path)
         
         if not node:
             return {"error": f"Node '{node_path}' not found"}
         
+        cached_path = node.path()
+        with self._node_cache_lock:
+            self._node_cache.pop(cached_path, None)
         node.destroy()
         return {"message": f"Node '{node_path}' deleted"}
 
@@ -383,11 +828,7 @@ class HoudiniMCPServer:
         if not node_path:
             return {"error": "No node path provided"}
         
-        node = hou.node(node_path)
-        if not node:
-            # Try with /obj/ prefix if not specified
-            if not node_path.startswith("/"):
-                node = hou.node(f"/obj/{node_path}")
+        node = self._resolve_node(node_path)
         
         if not node:
             return {"error": f"Node '{node_path}' not found"}
@@ -403,24 +844,25 @@ class HoudiniMCPServer:
         mat_node = hou.node(f"/mat/{material_name}")
         if not mat_node:
             # Create a new material
-            mat_context = hou.node("/mat")
+            mat_context = self._resolve_node("/mat")
             mat_node = mat_context.createNode("principledshader", material_name)
             
-            # Set material parameters if provided
+            # Set material parameters if provided, in a single setParms call
+            mat_parms = {}
             color = params.get("color")
             if color and len(color) >= 3:
-                mat_node.parm("basecolorr").set(color[0])
-                mat_node.parm("basecolorg").set(color[1])
-                mat_node.parm("basecolorb").set(color[2])
-                
-            # Set other material properties if provided
+                mat_parms.update(basecolorr=color[0], basecolorg=color[1], basecolorb=color[2])
+            
             roughness = params.get("roughness")
             if roughness is not None:
-                mat_node.parm("rough").set(roughness)
-                
+                mat_parms["rough"] = roughness
+            
             metallic = params.get("metallic")
             if metallic is not None:
-                mat_node.parm("metallic").set(metallic)
+                mat_parms["metallic"] = metallic
+            
+            if mat_parms:
+                mat_node.setParms(mat_parms)
         
         # Assign material to object
         # In Houdini, we typically assign materials at the SOP level or use a material SOP
@@ -437,7 +879,7 @@ class HoudiniMCPServer:
         """Create a FLIP fluid simulation setup"""
         # Create a container for the simulation
         name = params.get("name", "fluid_sim")
-        container = hou.node("/obj").createNode("geo", name)
+        container = self._resolve_node("/obj").createNode("geo", name)
         
         # Create DOP Network for simulation
         dopnet = container.createNode("dopnet", "fluid_dopnet")
@@ -539,7 +981,7 @@ class HoudiniMCPServer:
         """Create a Pyro simulation for fire and smoke"""
         # Create a container for the simulation
         name = params.get("name", "pyro_sim")
-        container = hou.node("/obj").createNode("geo", name)
+        container = self._resolve_node("/obj").createNode("geo", name)
         
         # Create DOP Network for simulation
         dopnet = container.createNode("dopnet", "pyro_dopnet")
@@ -651,13 +1093,14 @@ class HoudiniMCPServer:
         if not node_path:
             return {"error": "No node path provided"}
         
-        node = hou.node(node_path)
+        node = self._resolve_node(node_path)
         if not node:
             return {"error": f"Node '{node_path}' not found"}
         
         # Get frame range to simulate
-        start_frame = params.get("start_frame", hou.playbar.playbackRange()[0])
-        end_frame = params.get("end_frame", hou.playbar.playbackRange()[1])
+        playback_start, playback_end = hou.playbar.playbackRange()
+        start_frame = params.get("start_frame", playback_start)
+        end_frame = params.get("end_frame", playback_end)
         
         # Set current frame to start frame
         hou.setFrame(start_frame)
@@ -678,15 +1121,18 @@ class HoudiniMCPServer:
         
         # Run simulation
         try:
-            for frame in range(int(start_frame), int(end_frame) + 1):
-                # Print progress
-                print(f"Simulating frame {frame}/{end_frame}")
-                
-                # Simulate one frame
-                hou.setFrame(frame)
-                
-                # Force cook the DOP Network to update the simulation
-                dopnet.cook(force=True)
+            logger.debug("Simulating frames %s-%s", start_frame, end_frame)
+            try:
+                # Cook the whole range in one call instead of a setFrame/cook per frame
+                dopnet.cook(force=True, frame_range=(int(start_frame), int(end_frame)))
+            except TypeError:
+                # Node.cook() without frame_range support (Houdini < 16)
+                for frame in range(int(start_frame), int(end_frame) + 1):
+                    hou.setFrame(frame)
+                    dopnet.cook(force=True)
+            
+            # Leave the playhead on the last frame, as stepping through the range did
+            hou.setFrame(end_frame)
             
             return {
                 "message": f"Simulation completed from frame {start_frame} to {end_frame}",
@@ -706,15 +1152,15 @@ class HoudiniMCPServer:
             # Create a local dictionary to capture outputs
             local_dict = {}
             
-            # Execute the code
-            exec(code, globals(), local_dict)
+            # Execute the code, reusing the compiled code object for repeated snippets
+            exec(_compile_code(code), globals(), local_dict)
             
             # Return any variable named 'result' if it exists
             result = local_dict.get("result", {"message": "Code executed successfully"})
             
             return result
         except Exception as e:
-            traceback.print_exc()
+            logger.debug("execute_houdini_code failed", exc_info=True)
             return {"error": f"Code execution failed: {str(e)}"}
 
 # Panel class for Houdini UI
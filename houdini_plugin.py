@@ -2,7 +2,6 @@ import socket
 import json
 import threading
 import time
-import traceback
 import os
 import tempfile
 import logging
@@ -37,6 +36,8 @@ command_executor = None
 INSIDE_HOUDINI = False
 hou = None
 hdefereval = None
+_INIT_LOCK = threading.Lock()
+_INIT_RESULT: Optional[bool] = None
 
 # Create a dummy Houdini module for when running outside Houdini
 class DummyHou:
@@ -45,31 +46,33 @@ class DummyHou:
 
 def init_houdini_modules() -> bool:
     """Initialize Houdini modules if available"""
-    global INSIDE_HOUDINI, hou, hdefereval
+    global INSIDE_HOUDINI, hou, hdefereval, _INIT_RESULT
     
-    # Only initialize once
-    if INSIDE_HOUDINI or hou is not None:
-        return True
+    # Only initialize once; the lock keeps concurrent callers from racing the import
+    if _INIT_RESULT is not None:
+        return _INIT_RESULT
+    with _INIT_LOCK:
+        if _INIT_RESULT is not None:
+            return _INIT_RESULT
         
-    # Try to import Houdini modules - will only work within Houdini
-    try:
-        # Define module names as strings to prevent direct imports
-        hou_module_name = "h" + "ou"  # Split to avoid linter detection
-        hdefereval_module_name = "hdefere" + "val"  # Split to avoid linter detection
-        
-        # Import using __import__ which is more flexible than direct imports
-        hou = __import__(hou_module_name)
-        hdefereval = __import__(hdefereval_module_name)
-        
-        INSIDE_HOUDINI = True
-        logger.info("Successfully initialized Houdini modules")
-        return True
-    except ImportError as e:
-        logger.warning(f"Not running inside Houdini - {str(e)}")
-        INSIDE_HOUDINI = False
-        hou = DummyHou()
-        hdefereval = None
-        return False
+        # Try to import Houdini modules - will only work within Houdini
+        try:
+            # Define module names as strings to prevent direct imports
+            hou_module_name = "h" + "ou"  # Split to avoid linter detection
+            hdefereval_module_name = "hdefere" + "val"  # Split to avoid linter detection
+            
+            hou = importlib.import_module(hou_module_name)
+            hdefereval = importlib.import_module(hdefereval_module_name)
+            
+            INSIDE_HOUDINI = True
+            logger.info("Successfully initialized Houdini modules")
+        except ImportError as e:
+            logger.warning("Not running inside Houdini - %s", e)
+            INSIDE_HOUDINI = False
+            hou = DummyHou()
+            hdefereval = None
+        _INIT_RESULT = INSIDE_HOUDINI
+        return _INIT_RESULT
 
 def show_dialog() -> None:
     """
@@ -103,7 +106,7 @@ def show_dialog() -> None:
         
     except Exception as e:
         logger.error(f"Error showing dialog: {str(e)}")
-        traceback.print_exc()
+        logger.debug("show_dialog failure", exc_info=True)
 
 def _create_and_show_dialog() -> None:
     """Create and show the connection dialog"""
@@ -142,7 +145,7 @@ def _create_and_show_dialog() -> None:
         
     except Exception as e:
         logger.error(f"Error creating dialog: {str(e)}")
-        traceback.print_exc()
+        logger.debug("Dialog creation failure", exc_info=True)
 
 def _start_server_from_dialog(dialog: Any, kwargs: Dict[str, Any]) -> None:
     """Start the server from the dialog"""
@@ -162,7 +165,7 @@ def _start_server_from_dialog(dialog: Any, kwargs: Dict[str, Any]) -> None:
             
     except Exception as e:
         logger.error(f"Error starting server from dialog: {str(e)}")
-        traceback.print_exc()
+        logger.debug("Dialog start failure", exc_info=True)
         dialog.setValue("status", f"Server Status: Error - {str(e)}")
 
 def _stop_server_from_dialog(dialog: Any, kwargs: Dict[str, Any]) -> None:
@@ -179,7 +182,7 @@ def _stop_server_from_dialog(dialog: Any, kwargs: Dict[str, Any]) -> None:
             
     except Exception as e:
         logger.error(f"Error stopping server from dialog: {str(e)}")
-        traceback.print_exc()
+        logger.debug("Dialog stop failure", exc_info=True)
         dialog.setValue("status", f"Server Status: Error - {str(e)}")
 
 def start_server(host: str = "localhost", port: int = 8095) -> bool:
@@ -221,7 +224,7 @@ def start_server(host: str = "localhost", port: int = 8095) -> bool:
         
     except Exception as e:
         logger.error(f"Error starting server: {str(e)}")
-        traceback.print_exc()
+        logger.debug("start_server failure", exc_info=True)
         return False
 
 def stop_server() -> bool:
@@ -244,7 +247,7 @@ def stop_server() -> bool:
         
     except Exception as e:
         logger.error(f"Error stopping server: {str(e)}")
-        traceback.print_exc()
+        logger.debug("stop_server failure", exc_info=True)
         return False
 
 # Initialize the command executor if possible
@@ -253,10 +256,11 @@ if CommandExecutor is not None:
         command_executor = CommandExecutor()
     except Exception as e:
         logger.error(f"Could not initialize CommandExecutor: {str(e)}")
-        traceback.print_exc()
+        logger.debug("CommandExecutor init failure", exc_info=True)
 
-# When imported, automatically show the dialog if in UI mode
-if __name__ != "__main__":
+# When imported, automatically show the dialog if in UI mode, unless the importer
+# sets HOUDINI_MCP_NOAUTO to start things itself
+if __name__ != "__main__" and os.environ.get("HOUDINI_MCP_NOAUTO", "0") == "0":
     try:
         # Try to initialize Houdini modules
         has_houdini = init_houdini_modules()
@@ -273,7 +277,7 @@ if __name__ != "__main__":
                 start_server()
     except Exception as e:
         logger.error(f"Error during automatic initialization: {str(e)}")
-        traceback.print_exc()
+        logger.debug("Automatic initialization failure", exc_info=True)
 
 # Allow direct execution
 if __name__ == "__main__":
@@ -2,8 +2,13 @@ import argparse
 import logging
 import sys
 import os
+import signal
+import threading
 from typing import Optional
-from houdini_plugin import show_dialog, start_server, stop_server
+
+# houdini_plugin starts the server or dialog on import; the subcommands below do
+# that explicitly, so turn it off before the plugin is imported
+os.environ.setdefault("HOUDINI_MCP_NOAUTO", "1")
 
 # Configure logging
 def setup_logging(log_to_file: bool = False, log_level: str = "INFO", log_dir: Optional[str] = None) -> None:
@@ -52,6 +57,17 @@ def setup_logging(log_to_file: bool = False, log_level: str = "INFO", log_dir: O
 # Get logger for this module
 logger = logging.getLogger("HoudiniMCP.Main")
 
+# Set by SIGINT/SIGTERM to stop the foreground server
+_shutdown = threading.Event()
+
+# Windows only delivers Ctrl+C between bytecodes, so an untimed wait would never
+# see it; elsewhere the wait blocks until a signal arrives
+_SHUTDOWN_POLL = 1.0 if sys.platform == "win32" else None
+
+def _request_shutdown(signum, frame) -> None:
+    """Signal handler that wakes the server wait loop"""
+    _shutdown.set()
+
 def main() -> int:
     """
     Main entry point for the Houdini-MCP package.
@@ -92,6 +108,9 @@ def main() -> int:
     
     # Handle command
     if args.command == "server":
+        # Imported here so --help and the rest command don't initialize the plugin
+        from houdini_plugin import start_server, stop_server
+        
         # Start the server directly
         logger.info(f"Starting MCP server on {args.host}:{args.port}")
         success = start_server(args.host, args.port)
@@ -100,15 +119,15 @@ def main() -> int:
             logger.info("Server started successfully")
             logger.info("Press Ctrl+C to stop the server")
             
-            # Keep the script running
-            try:
-                while True:
-                    import time
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("Stopping server...")
-                stop_server()
-                logger.info("Server stopped")
+            # Keep the script running until SIGINT or SIGTERM
+            signal.signal(signal.SIGINT, _request_shutdown)
+            signal.signal(signal.SIGTERM, _request_shutdown)
+            while not _shutdown.wait(_SHUTDOWN_POLL):
+                pass
+            
+            logger.info("Stopping server...")
+            stop_server()
+            logger.info("Server stopped")
         else:
             logger.error("Failed to start server")
             return 1
@@ -132,6 +151,7 @@ def main() -> int:
         
     elif args.command == "gui":
         # Show the dialog in Houdini
+        from houdini_plugin import show_dialog
         logger.info("Showing MCP dialog in Houdini")
         show_dialog()
         
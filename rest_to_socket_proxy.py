@@ -1,10 +1,27 @@
 import socket
+import select
+import struct
+import queue
+import contextlib
+import threading
 import json
 import logging
 import sys
 import os
-from typing import Dict, Any, Optional, Union, List
-from flask import Flask, request, jsonify, send_file
+from typing import Dict, Any, Optional, Union, List, Tuple
+from flask import Flask, Response, request, send_file
+
+# orjson is an optional speedup; fall back to the stdlib encoder when missing
+try:
+    import orjson
+    # orjson encodes straight to UTF-8 bytes and parses bytes without decoding first
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _encode = json.JSONEncoder().encode
+    def _dumps(obj: Any) -> bytes:
+        return _encode(obj).encode('utf-8')
+    _loads = json.loads
 
 # Configure logging
 logging.basicConfig(
@@ -14,18 +31,202 @@ logging.basicConfig(
 logger = logging.getLogger("HoudiniMCP.RESTProxy")
 
 app = Flask(__name__)
+# Serve "/mcp/status/" and "/mcp/status" alike rather than answering one with a
+# redirect that costs the client a second round trip; must be set before the routes
+app.url_map.strict_slashes = False
 
 # Default configuration
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 8095
 DEFAULT_API_PORT = 5000
 
+# Every message to and from the socket server is prefixed with its length as a
+# 4-byte big-endian integer
+_HEADER = struct.Struct(">I")
+# Bound once for the per-request framing helpers
+_pack_header = _HEADER.pack
+_unpack_header = _HEADER.unpack_from
+_HEADER_SIZE = _HEADER.size
+
+# Number of idle connections kept open to the socket server
+DEFAULT_POOL_SIZE = int(os.environ.get("HOUDINI_MCP_POOL_SIZE", "8"))
+
+# Seconds to wait for a command's response, by command type. Houdini runs commands
+# on its main thread, so a fast command that takes this long means Houdini is stuck,
+# while building a simulation network legitimately takes much longer
+DEFAULT_COMMAND_TIMEOUT = 30.0
+COMMAND_TIMEOUTS: Dict[str, float] = {
+    "list_available_commands": 5.0,
+    "get_scene_info": 10.0,
+    "create_fluid_sim": 120.0,
+    "create_pyro_sim": 120.0,
+    "run_simulation": 120.0,
+    "bulk_ops": 300.0,
+    "execute_houdini_code": 300.0,
+}
+
+# Seconds a request waits for a free connection before getting a 503
+DEFAULT_QUEUE_TIMEOUT = float(os.environ.get("HOUDINI_MCP_QUEUE_TIMEOUT", "30"))
+
 # Path to schema file
 SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "command_schema.json")
 
+class PoolExhausted(Exception):
+    """Raised when no connection slot frees up within the pool's queue timeout"""
+
+class SocketPool:
+    """
+    Thread-safe pool of keep-alive connections to the Houdini MCP socket server,
+    so REST requests don't pay a TCP handshake (and an ephemeral port) each.
+    At most size connections are in use at once; further requests queue for a slot
+    """
+    
+    def __init__(self, host: str, port: int, size: int = DEFAULT_POOL_SIZE, timeout: float = 10.0,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        # LIFO so the most recently used (least likely to have gone stale) socket is reused first
+        self._idle = queue.LifoQueue(maxsize=size)
+        # Houdini runs commands one at a time, so a burst beyond this only piles up
+        # sockets on its side; make the excess wait here instead
+        self._slots = threading.BoundedSemaphore(size)
+        self._in_use = 0
+        self._in_use_lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+    
+    def _connect(self) -> socket.socket:
+        """Open a new connection with keep-alive enabled"""
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+        logger.info("Connected to Houdini MCP server at %s:%d", self.host, self.port)
+        return sock
+    
+    def acquire(self) -> Tuple[socket.socket, bool]:
+        """Return (socket, reused): an idle healthy connection if there is one, else a new one"""
+        while True:
+            try:
+                sock = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), False
+            try:
+                # An idle connection should have nothing to read; readable means the
+                # server closed it (or sent stray data), so it can't be reused
+                readable, _, errored = select.select([sock], [], [sock], 0)
+            except (OSError, ValueError):
+                readable = errored = True
+            if not readable and not errored:
+                return sock, True
+            sock.close()
+    
+    def release(self, sock: socket.socket) -> None:
+        """Return a connection whose last response was read completely"""
+        try:
+            self._idle.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+    
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Borrow a connection; it goes back to the pool if the block completes and is
+        closed if the block raises, since a half-read response would desync it.
+        Callers must therefore read the whole response inside the block and let any
+        error (including an unparseable response) propagate out of it
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PoolExhausted(f"No connection to {self.host}:{self.port} became free within {self.queue_timeout}s")
+        with self._in_use_lock:
+            self._in_use += 1
+        try:
+            sock, reused = self.acquire()
+            with self._in_use_lock:
+                if reused:
+                    self._reused += 1
+                else:
+                    self._created += 1
+            try:
+                yield sock, reused
+            except BaseException:
+                sock.close()
+                raise
+            self.release(sock)
+        finally:
+            with self._in_use_lock:
+                self._in_use -= 1
+            self._slots.release()
+    
+    def stats(self) -> Dict[str, int]:
+        """Connection counts, without touching the socket server"""
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle": self._idle.qsize(),
+            "created": self._created,
+            "reused": self._reused
+        }
+    
+    def close(self) -> None:
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+# Created in main(), or on first use with the default address
+_pool: Optional[SocketPool] = None
+
+def _get_pool() -> SocketPool:
+    global _pool
+    if _pool is None:
+        _pool = SocketPool(DEFAULT_HOST, DEFAULT_PORT)
+    return _pool
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    """Read exactly size bytes from the socket into a preallocated buffer"""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError(f"Connection closed after {received} of {size} bytes")
+        received += n
+    return buf
+
+def _send_framed(sock: socket.socket, obj: Dict[str, Any]) -> None:
+    """Send one length-prefixed JSON message"""
+    data = _dumps(obj)
+    sock.sendall(_pack_header(len(data)) + data)
+
+def _recv_framed(sock: socket.socket) -> Any:
+    """Receive one length-prefixed JSON message; the body is parsed exactly once"""
+    (length,) = _unpack_header(_recv_exactly(sock, _HEADER_SIZE))
+    return _loads(_recv_exactly(sock, length))
+
+class _SendFailed(ConnectionError):
+    """The connection broke before the command was written, so Houdini never ran it"""
+
+def _exchange(sock: socket.socket, command_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one command on a connection and read back its response"""
+    sock.settimeout(COMMAND_TIMEOUTS.get(command_data.get('type'), DEFAULT_COMMAND_TIMEOUT))
+    try:
+        _send_framed(sock, command_data)
+    except ConnectionError as e:
+        raise _SendFailed(str(e)) from e
+    logger.info("Sent command: %s", command_data.get('type'))
+    return _recv_framed(sock)
+
 def send_to_socket(command_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Send a command to the Houdini MCP socket server
+    Send a command to the Houdini MCP socket server over a pooled connection
     
     Args:
         command_data: Command data to send
@@ -33,45 +234,34 @@ def send_to_socket(command_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict containing the response from the server
     """
+    pool = _get_pool()
+    reused = False
     try:
-        # Create socket
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.settimeout(10.0)  # 10 second timeout
-        
-        # Connect to server
-        client.connect((DEFAULT_HOST, DEFAULT_PORT))
-        logger.info(f"Connected to Houdini MCP server at {DEFAULT_HOST}:{DEFAULT_PORT}")
-        
-        # Send command
-        command_json = json.dumps(command_data)
-        client.sendall(command_json.encode('utf-8'))
-        logger.info(f"Sent command: {command_json}")
-        
-        # Receive response
-        response_data = b''
-        while True:
-            chunk = client.recv(4096)
-            if not chunk:
-                break
-            response_data += chunk
-            
-            # Try to parse the response to see if it's complete
-            try:
-                json.loads(response_data.decode('utf-8'))
-                # If we can parse it, we have a complete response
-                break
-            except json.JSONDecodeError:
-                # Not complete yet, continue receiving
-                continue
-                
-        # Parse response
-        response = json.loads(response_data.decode('utf-8'))
-        logger.info(f"Received response: {json.dumps(response, indent=2)}")
-        
-        # Close connection
-        client.close()
+        try:
+            with pool.connection() as (client, reused):
+                response = _exchange(client, command_data)
+        except _SendFailed:
+            if not reused:
+                raise
+            # The server dropped an idle pooled connection before the command reached it;
+            # retry once on a fresh one. A failure while reading the response is never
+            # retried, since the command (e.g. create_node) may already have run.
+            logger.info("Pooled connection was closed by the server, reconnecting")
+            with pool.connection() as (client, _):
+                response = _exchange(client, command_data)
         
+        logger.info("Received response with status: %s", response.get('status'))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", json.dumps(response, indent=2))
         return response
+    except PoolExhausted as e:
+        logger.warning(str(e))
+        return {
+            "status": "error",
+            "code": 503,  # Service Unavailable
+            "message": "Houdini MCP server is busy, retry later",
+            "retry_after": 1
+        }
     except socket.timeout:
         logger.error("Connection to Houdini MCP server timed out")
         return {
@@ -94,23 +284,83 @@ def send_to_socket(command_data: Dict[str, Any]) -> Dict[str, Any]:
             "message": f"Error sending command to socket: {str(e)}"
         }
 
+# Status probe currently in flight: {"done": Event, "response": dict}, or None
+_status_flight: Optional[Dict[str, Any]] = None
+_status_lock = threading.Lock()
+
+def probe_status() -> Dict[str, Any]:
+    """
+    Ask the socket server for its command list, sharing one in-flight request
+    among concurrent callers so a burst of health checks costs Houdini one command
+    """
+    global _status_flight
+    with _status_lock:
+        flight = _status_flight
+        leader = flight is None
+        if leader:
+            flight = _status_flight = {"done": threading.Event(), "response": None}
+    
+    if not leader:
+        flight["done"].wait()
+        return dict(flight["response"])
+    
+    try:
+        flight["response"] = send_to_socket({
+            "type": "list_available_commands"
+        })
+    except Exception as e:
+        flight["response"] = {
+            "status": "error",
+            "code": 500,
+            "message": f"Error checking status: {str(e)}"
+        }
+    finally:
+        with _status_lock:
+            _status_flight = None
+        flight["done"].set()
+    return dict(flight["response"])
+
+# (mtime, parsed schema, schema encoded as JSON) of the last schema file read;
+# replaced as one tuple so concurrent requests never see a mismatched pair
+_schema_cache: Tuple[Optional[int], Optional[Dict[str, Any]], Optional[bytes]] = (None, None, None)
+
 def load_command_schema() -> Dict[str, Any]:
     """
-    Load the command schema from the JSON file
+    Load the command schema from the JSON file, re-reading it only when the
+    file has been modified since the last load
     
     Returns:
         Dict containing the command schema
     """
+    global _schema_cache
     try:
-        if os.path.exists(SCHEMA_FILE_PATH):
-            with open(SCHEMA_FILE_PATH, 'r') as f:
-                return json.load(f)
-        else:
-            logger.warning(f"Schema file not found at {SCHEMA_FILE_PATH}")
-            return {"error": "Schema file not found"}
+        mtime = os.stat(SCHEMA_FILE_PATH).st_mtime_ns
+    except FileNotFoundError:
+        logger.warning("Schema file not found at %s", SCHEMA_FILE_PATH)
+        return {"error": "Schema file not found"}
+    except OSError as e:
+        logger.error(f"Error loading schema: {str(e)}")
+        return {"error": f"Error loading schema: {str(e)}"}
+    
+    cached_mtime, schema, _ = _schema_cache
+    if cached_mtime == mtime:
+        return schema
+    
+    try:
+        with open(SCHEMA_FILE_PATH, 'r') as f:
+            schema = json.load(f)
     except Exception as e:
         logger.error(f"Error loading schema: {str(e)}")
         return {"error": f"Error loading schema: {str(e)}"}
+    _schema_cache = (mtime, schema, _dumps(schema))
+    return schema
+
+def _json_response(obj: Any) -> Response:
+    """JSON response encoded with _dumps, skipping jsonify's stdlib encoder"""
+    return Response(_dumps(obj), mimetype='application/json')
+
+# Field names used by the older /houdini/run endpoint, mapped to their /mcp/command names
+_LEGACY_FIELDS = {"command": "type", "args": "params"}
 
 @app.route('/mcp/command', methods=['POST'])
 def handle_command():
@@ -121,11 +371,34 @@ def handle_command():
         - type: Command type
         - params: Command parameters (optional)
     """
+    return _run_command_request()
+
+@app.route('/houdini/run', methods=['POST'])
+def handle_legacy_run():
+    """
+    Handle POST requests to /houdini/run, kept for older clients
+    
+    Request body should be a JSON object with:
+        - command: Command type
+        - args: Command parameters (optional)
+    """
+    return _run_command_request(_LEGACY_FIELDS)
+
+def _run_command_request(field_map: Optional[Dict[str, str]] = None):
+    """Validate the command in the request body, forward it, and build the HTTP response"""
     try:
-        # Get request data
-        data = request.get_json()
+        # Parse the body ourselves with _loads rather than through get_json's stdlib parser
+        raw = request.get_data(cache=False)
+        try:
+            data = _loads(raw) if raw else None
+        except ValueError:
+            return _json_response({
+                "status": "error",
+                "code": 400,
+                "message": "Invalid JSON data received"
+            }), 400
         if not data:
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 400,
                 "message": "No JSON data received"
@@ -133,14 +406,17 @@ def handle_command():
             
         # Validate data
         if not isinstance(data, dict):
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 400,
                 "message": "Invalid data format: expected JSON object"
             }), 400
+        
+        if field_map:
+            data = {field_map.get(key, key): value for key, value in data.items()}
             
         if "type" not in data:
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 400,
                 "message": "Missing required field: type"
@@ -155,12 +431,16 @@ def handle_command():
             # Remove code from response to avoid duplication
             if "code" in response:
                 del response["code"]
-            return jsonify(response), code
+            retry_after = response.pop("retry_after", None)
+            resp = _json_response(response)
+            if retry_after is not None:
+                resp.headers["Retry-After"] = str(retry_after)
+            return resp, code
         else:
-            return jsonify(response), 200
+            return _json_response(response), 200
     except Exception as e:
         logger.error(f"Error handling command: {str(e)}")
-        return jsonify({
+        return _json_response({
             "status": "error",
             "code": 500,
             "message": f"Error handling command: {str(e)}"
@@ -172,21 +452,19 @@ def handle_status():
     Handle GET requests to /mcp/status
     """
     try:
-        # Send status command to socket server
-        response = send_to_socket({
-            "type": "list_available_commands"
-        })
+        # Send status command to socket server (shared with concurrent status checks)
+        response = probe_status()
         
         # Check if we got a valid response
         if response.get("status") == "success":
-            return jsonify({
+            return _json_response({
                 "status": "success",
                 "message": "Houdini MCP server is running",
                 "available_commands": response.get("commands", [])
             }), 200
         else:
             error_code = response.get("code", 500)
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": error_code,
                 "message": "Houdini MCP server is not responding properly",
@@ -194,12 +472,23 @@ def handle_status():
             }), error_code
     except Exception as e:
         logger.error(f"Error checking status: {str(e)}")
-        return jsonify({
+        return _json_response({
             "status": "error",
             "code": 500,
             "message": f"Error checking status: {str(e)}"
         }), 500
 
+@app.route('/mcp/health', methods=['GET'])
+def handle_health():
+    """
+    Handle GET requests to /mcp/health
+    Reports the proxy's connection pool without forwarding anything to Houdini
+    """
+    return _json_response({
+        "status": "success",
+        "pool": _get_pool().stats()
+    }), 200
+
 @app.route('/mcp/schema', methods=['GET'])
 def handle_schema():
     """
@@ -212,16 +501,23 @@ def handle_schema():
         
         # Check if there was an error loading the schema
         if "error" in schema:
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 500,
                 "message": schema["error"]
             }), 500
-            
-        return jsonify(schema), 200
+        
+        # The cached schema is served as the bytes encoded when it was loaded, tagged
+        # with the file's mtime so clients that already have it get a bodiless 304
+        cached_mtime, cached_schema, body = _schema_cache
+        if schema is cached_schema:
+            response = Response(body, mimetype='application/json')
+            response.set_etag(format(cached_mtime, 'x'))
+            return response.make_conditional(request)
+        return _json_response(schema), 200
     except Exception as e:
         logger.error(f"Error retrieving schema: {str(e)}")
-        return jsonify({
+        return _json_response({
             "status": "error",
             "code": 500,
             "message": f"Error retrieving schema: {str(e)}"
@@ -239,7 +535,7 @@ def handle_command_schema(command_name):
         
         # Check if there was an error loading the schema
         if "error" in schema:
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 500,
                 "message": schema["error"]
@@ -248,16 +544,16 @@ def handle_command_schema(command_name):
         # Get command-specific schema
         commands = schema.get("commands", {})
         if command_name in commands:
-            return jsonify(commands[command_name]), 200
+            return _json_response(commands[command_name]), 200
         else:
-            return jsonify({
+            return _json_response({
                 "status": "error",
                 "code": 404,
                 "message": f"Command '{command_name}' not found in schema"
             }), 404
     except Exception as e:
         logger.error(f"Error retrieving command schema: {str(e)}")
-        return jsonify({
+        return _json_response({
             "status": "error",
             "code": 500,
             "message": f"Error retrieving command schema: {str(e)}"
@@ -267,7 +563,7 @@ def main() -> None:
     """
     Main entry point for the REST proxy
     """
-    global DEFAULT_HOST, DEFAULT_PORT, DEFAULT_API_PORT
+    global DEFAULT_HOST, DEFAULT_PORT, DEFAULT_API_PORT, _pool
     
     # Parse command line arguments
     if len(sys.argv) > 1:
@@ -284,13 +580,17 @@ def main() -> None:
             print(f"Invalid API port number: {sys.argv[2]}")
             print(f"Using default: {DEFAULT_API_PORT}")
     
+    _pool = SocketPool(DEFAULT_HOST, DEFAULT_PORT)
+    
     # Start REST API server
-    logger.info(f"Starting REST API server on localhost:{DEFAULT_API_PORT}")
-    logger.info(f"Will forward requests to socket server at {DEFAULT_HOST}:{DEFAULT_PORT}")
+    logger.info("Starting REST API server on localhost:%d", DEFAULT_API_PORT)
+    logger.info("Will forward requests to socket server at %s:%d", DEFAULT_HOST, DEFAULT_PORT)
     logger.info("For security reasons, the API will only accept connections from localhost")
     
     # Run Flask app - only accept connections from localhost (127.0.0.1)
-    app.run(host="127.0.0.1", port=DEFAULT_API_PORT)
+    # Requests are served on their own threads, so a command waiting on Houdini
+    # doesn't hold up the others
+    app.run(host="127.0.0.1", port=DEFAULT_API_PORT, threaded=True)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
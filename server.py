@@ -1,81 +1,218 @@
+import os
+import re
+import collections
+import itertools
 import socket
+import selectors
+import struct
 import threading
-import time
-import traceback
 import json
 import logging
 from typing import Dict, Any
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import orjson
+    # orjson encodes straight to UTF-8 bytes in a single C pass, and parses
+    # bytes without a separate decode step
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _encode = json.JSONEncoder().encode
+    def _dumps(obj):
+        return _encode(obj).encode('utf-8')
+    # Accepts bytes too, detecting the encoding itself
+    _loads = json.loads
+
 logger = logging.getLogger("HoudiniMCP.Server")
 
+# Key under which a command executor may attach the already-serialized JSON
+# payload of its response, so the server does not have to encode it again
+SERIALIZED_RESPONSE_KEY = "_serialized"
+
+# Error responses whose content never varies, encoded once
+_EMPTY_REQUEST_RESPONSE = _dumps({
+    "status": "error",
+    "message": "Empty request received from client"
+})
+_NOT_AN_OBJECT_RESPONSE = _dumps({
+    "status": "error",
+    "message": "Invalid JSON received: expected a JSON object"
+})
+_NOT_A_DICT_RESPONSE = _dumps({
+    "status": "error",
+    "message": "Invalid command format: expected JSON object"
+})
+_MISSING_TYPE_RESPONSE = _dumps({
+    "status": "error",
+    "message": "Invalid command format: missing 'type' field"
+})
+_NO_EXECUTOR_RESPONSE = _dumps({
+    "status": "error",
+    "message": "Server is not configured to execute commands"
+})
+
+# Size of the scratch buffer the server thread receives into
+RECV_BUFFER_SIZE = 64 * 1024
+
+# Selector data marking the wake-up socket
+_WAKE = "wake"
+
+# Framed messages are a 4-byte big-endian length followed by that many bytes of
+# UTF-8 JSON. Unframed JSON from older clients starts with "{", "[" or whitespace;
+# because of MAX_MESSAGE_SIZE a frame header always starts with a byte below
+# _MAX_HEADER_LEAD, so the first byte of each message tells the two apart, and
+# each response uses the framing of its command.
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+_MAX_HEADER_LEAD = MAX_MESSAGE_SIZE >> 24
+# sendmsg (writev) is unavailable on Windows
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+# Most buffers handed to one sendmsg call; stays well under IOV_MAX
+_MAX_IOV = 64
+
+# Bytes that matter for finding where a JSON value ends; UTF-8 continuation
+# bytes never match these, so the scan works on raw bytes
+_JSON_STRUCTURE = re.compile(rb'[{}\[\]"\\]')
+_JSON_OPENERS = b"{["
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+def _scan_json(buf, i, end, depth, in_string):
+    """
+    Advance a bracket counter over buf[i:end], skipping string contents.
+    Returns (i, depth, in_string); depth 0 means the value is complete and ends at i.
+    Only the newly received bytes are scanned, so finding the end of a message
+    costs O(n) however many reads it arrives in.
+    """
+    search = _JSON_STRUCTURE.search
+    while True:
+        match = search(buf, i, end)
+        if match is None:
+            # i can be past end when an escape's second byte hasn't arrived yet
+            return max(i, end), depth, in_string
+        c = buf[match.start()]
+        i = match.start() + 1
+        if in_string:
+            if c == _BACKSLASH:
+                i += 1
+            elif c == _QUOTE:
+                in_string = False
+        elif c == _QUOTE:
+            in_string = True
+        elif c in _JSON_OPENERS:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return i, 0, False
+
+def _pin_current_thread():
+    """
+    Pin the calling thread to the CPU named by HOUDINI_MCP_CPU ("last" for the
+    highest-numbered core), keeping the receive buffers in one core's cache.
+    Unset leaves scheduling to the OS; a no-op where sched_setaffinity is missing.
+    """
+    cpu = os.environ.get("HOUDINI_MCP_CPU")
+    if not cpu or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cpu = os.cpu_count() - 1 if cpu == "last" else int(cpu)
+        # pid 0 is the calling thread on Linux
+        os.sched_setaffinity(0, {cpu})
+    except (ValueError, OSError) as e:
+        logger.warning("Could not pin server thread to CPU %s: %s", cpu, e)
+
 class HoudiniMCPServer:
     def __init__(self, host='localhost', port=9876, command_executor=None):
         self.host = host
         self.port = port
-        self.running = False
+        # Event because start/stop state is shared between the caller's thread and the reactor thread
+        self._running = threading.Event()
+        self._lifecycle_lock = threading.Lock()
         self.socket = None
+        self.selector = None
+        self._wake_r = None
+        self._wake_w = None
         self.server_thread = None
         self.logger = logger
         # This will be set from outside to handle command execution
         self.command_executor = command_executor
+        # Every read lands in this one buffer; only the server thread touches it
+        self._scratch = bytearray(RECV_BUFFER_SIZE)
     
-    def log(self, level, message):
-        """Log a message with the specified level"""
-        if level == "info":
-            self.logger.info(message)
-            print(message)  # Also print for backwards compatibility
-        elif level == "error":
-            self.logger.error(message)
-            print(message)  # Also print for backwards compatibility
-        elif level == "debug":
-            self.logger.debug(message)
+    def log(self, level, message, *args):
+        """Log a message with the specified level; args are %-formatted only if it is emitted"""
+        if level == "error":
+            self.logger.error(message, *args)
         elif level == "warning":
-            self.logger.warning(message)
-            print(message)  # Also print for backwards compatibility
+            self.logger.warning(message, *args)
+        elif level == "debug":
+            self.logger.debug(message, *args)
         else:
-            print(message)  # Fallback to print
+            self.logger.info(message, *args)
+    
+    @property
+    def running(self):
+        return self._running.is_set()
+    
+    def is_running(self):
+        """Return True while the server is accepting connections"""
+        return self._running.is_set()
     
     def start(self):
-        if self.running:
-            self.log("info", "Server is already running")
-            return True
+        with self._lifecycle_lock:
+            if self._running.is_set():
+                self.log("info", "Server is already running")
+                return True
+            self._running.set()
             
-        self.running = True
+        # Configure logging here rather than at import time so importing the
+        # package does not reconfigure the host application's logging
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
         
         try:
             # Create socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket.bind((self.host, self.port))
-            self.socket.listen(1)
+            # The MCP server and the REST proxy's pool can connect at the same time
+            self.socket.listen(socket.SOMAXCONN)
+            self.socket.setblocking(False)
+            
+            # A single selector (epoll/kqueue) multiplexes the listener and every
+            # client on the server thread instead of one thread per client
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.socket, selectors.EVENT_READ, None)
+            
+            # stop() writes to this pair to wake the selector, so it can block without a timeout
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self.selector.register(self._wake_r, selectors.EVENT_READ, _WAKE)
             
             # Start server thread
             self.server_thread = threading.Thread(target=self._server_loop)
             self.server_thread.daemon = True
             self.server_thread.start()
             
-            self.log("info", f"HoudiniMCP server started on {self.host}:{self.port}")
+            self.log("info", "HoudiniMCP server started on %s:%s", self.host, self.port)
             return True
         except Exception as e:
-            self.log("error", f"Failed to start server: {str(e)}")
+            self.log("error", "Failed to start server: %s", e)
             self.stop()
             return False
             
     def stop(self):
-        self.running = False
+        self._running.clear()
         
-        # Close socket
-        if self.socket:
+        # Wake the selector so the server loop sees the cleared flag immediately
+        if self._wake_w:
             try:
-                self.socket.close()
-            except:
+                self._wake_w.send(b"x")
+            except OSError:
                 pass
-            self.socket = None
         
         # Wait for thread to finish
         if self.server_thread:
@@ -86,209 +223,352 @@ class HoudiniMCPServer:
                 pass
             self.server_thread = None
         
+        # Close sockets; take them under the lock so concurrent stop() calls close them once
+        with self._lifecycle_lock:
+            sockets = (self.socket, self._wake_r, self._wake_w)
+            self.socket = self._wake_r = self._wake_w = None
+        for sock in sockets:
+            if sock:
+                try:
+                    sock.close()
+                except:
+                    pass
+        
         self.log("info", "HoudiniMCP server stopped")
     
     def _server_loop(self):
         """Main server loop in a separate thread"""
         self.log("info", "Server thread started")
-        self.socket.settimeout(1.0)  # Timeout to allow for stopping
+        _pin_current_thread()
+        selector = self.selector
         
-        while self.running:
-            try:
-                # Accept new connection
+        try:
+            while self.running:
                 try:
-                    client, address = self.socket.accept()
-                    self.log("info", f"Connected to client: {address}")
-                    
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                except socket.timeout:
-                    # Just check running condition
-                    continue
-                except Exception as e:
-                    self.log("error", f"Error accepting connection: {str(e)}")
-                    time.sleep(0.5)
-            except Exception as e:
-                self.log("error", f"Error in server loop: {str(e)}")
-                if not self.running:
+                    # Blocks until a socket is ready or stop() writes to the wake pair
+                    events = selector.select()
+                except (OSError, ValueError):
                     break
-                time.sleep(0.5)
+                
+                for key, mask in events:
+                    if key.data is None:
+                        self._accept_client()
+                    elif key.data is _WAKE:
+                        # Loop condition re-checks the running flag
+                        continue
+                    else:
+                        if mask & selectors.EVENT_WRITE:
+                            self._flush_client(key.fileobj, key.data)
+                        if mask & selectors.EVENT_READ and key.fileobj.fileno() != -1:
+                            self._read_client(key.fileobj, key.data)
+        except Exception as e:
+            self.log("error", "Error in server loop: %s", e)
+            self.logger.debug("Server loop failure", exc_info=True)
+        finally:
+            # Close any clients still connected
+            for key in list(selector.get_map().values()):
+                if isinstance(key.data, dict):
+                    self._close_client(key.fileobj)
+            selector.close()
         
         self.log("info", "Server thread stopped")
     
-    def _handle_client(self, client):
-        """Handle connected client"""
-        self.log("info", "Client handler started")
-        client.settimeout(None)  # No timeout
-        buffer = b''
+    def _accept_client(self):
+        """Accept a pending connection and register it with the selector"""
+        try:
+            client, address = self.socket.accept()
+        except (BlockingIOError, AttributeError, OSError) as e:
+            if not isinstance(e, BlockingIOError):
+                self.log("error", "Error accepting connection: %s", e)
+            return
+        self.log("info", "Connected to client: %s", address)
         
+        client.setblocking(False)
+        # Per-client state: bytes received but not yet parsed, buffers queued for
+        # sending, whether EVENT_WRITE is being watched for them, whether sends are
+        # held back until the current read has been handled, how far _scan_json
+        # has got through the message at the start of the buffer, whether the
+        # command being handled was framed (its response will be too), and the
+        # buffer length that completes a partially received frame
+        self.selector.register(client, selectors.EVENT_READ, {
+            "buffer": bytearray(), "outbox": collections.deque(), "writing": False, "corked": False,
+            "scan": 0, "depth": 0, "in_string": False, "framed": False, "need": 0
+        })
+    
+    def _close_client(self, client):
+        """Unregister and close a client connection"""
         try:
-            while self.running:
-                # Receive data
-                try:
-                    data = client.recv(8192)
-                    if not data:
-                        self.log("info", "Client disconnected")
-                        break
-                    
-                    # Check if data is empty after whitespace stripping
-                    if len(data.strip()) == 0:
-                        self.log("warning", "Empty data received")
-                        error_response = {
-                            "status": "error",
-                            "message": "Empty request received from client"
-                        }
-                        client.sendall(json.dumps(error_response).encode('utf-8'))
-                        continue
-                    
-                    buffer += data
-                    try:
-                        # Try to parse command
+            self.selector.unregister(client)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.close()
+        except:
+            pass
+        self.log("info", "Client disconnected")
+    
+    def _send(self, client, payload):
+        """Queue a response and send what the socket takes now; the rest waits for EVENT_WRITE"""
+        try:
+            state = self.selector.get_key(client).data
+        except (KeyError, ValueError):
+            # Client already closed
+            return
+        outbox = state["outbox"]
+        # Header and body stay separate buffers, behind anything already queued
+        if state["framed"]:
+            outbox.append(memoryview(_HEADER.pack(len(payload))))
+        outbox.append(memoryview(payload))
+        if not state["corked"]:
+            self._flush_client(client, state)
+    
+    def _flush_client(self, client, state):
+        """Send queued buffers until the socket would block; watch EVENT_WRITE only while some remain"""
+        outbox = state["outbox"]
+        try:
+            while outbox:
+                if _HAS_SENDMSG:
+                    # Scatter-gather: queued headers and bodies go out in one syscall
+                    sent = client.sendmsg(itertools.islice(outbox, _MAX_IOV))
+                else:
+                    sent = client.send(outbox[0])
+                # Drop fully sent buffers and slice the partially sent one, without copying
+                while sent:
+                    head = outbox[0]
+                    if len(head) <= sent:
+                        sent -= len(head)
+                        outbox.popleft()
+                    else:
+                        outbox[0] = head[sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            self.log("error", "Failed to send response: %s", e)
+            self._close_client(client)
+            return
+        
+        writing = bool(outbox)
+        if writing != state["writing"]:
+            state["writing"] = writing
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE if writing else selectors.EVENT_READ
+            self.selector.modify(client, events, state)
+    
+    def _read_client(self, client, state):
+        """Read available data from a client and handle every complete command"""
+        buffer = state["buffer"]
+        view = memoryview(self._scratch)
+        try:
+            n = client.recv_into(view)
+        except BlockingIOError:
+            return
+        except Exception as e:
+            self.log("error", "Error receiving data: %s", e)
+            n = 0
+        if not n:
+            self._close_client(client)
+            return
+        
+        had_partial = bool(buffer)
+        buffer.extend(view[:n])
+        view.release()
+        
+        # Responses to every command in this read go out together in one sendmsg
+        state["corked"] = True
+        try:
+            self._handle_buffer(client, state, had_partial)
+        finally:
+            state["corked"] = False
+            if state["outbox"] and client.fileno() != -1:
+                self._flush_client(client, state)
+    
+    def _handle_buffer(self, client, state, had_partial):
+        """Handle every complete command in the client's receive buffer"""
+        buffer = state["buffer"]
+        try:
+            # Check if data is empty after whitespace stripping
+            if not had_partial and buffer.isspace():
+                self.log("warning", "Empty data received")
+                self._send(client, _EMPTY_REQUEST_RESPONSE)
+                buffer.clear()
+                return
+            
+            # Handle every complete command in the buffer
+            while buffer:
+                if state["need"] and len(buffer) < state["need"]:
+                    # Still waiting for the rest of a frame whose header was already read
+                    break
+                if not state["scan"]:
+                    # Start of a new command: drop whitespace left after the previous one
+                    # (checked first, since lstrip copies the whole buffer)
+                    if buffer[:1].isspace():
+                        del buffer[:len(buffer) - len(buffer.lstrip())]
+                        if not buffer:
+                            break
+                    if buffer[0] < _MAX_HEADER_LEAD:
+                        # Length-prefixed frame: parse once, when the whole body is here
+                        if len(buffer) < _HEADER.size:
+                            break
+                        # The lead-byte check above already bounds length below MAX_MESSAGE_SIZE
+                        (length,) = _HEADER.unpack_from(buffer)
+                        state["framed"] = True
+                        end = _HEADER.size + length
+                        if len(buffer) < end:
+                            state["need"] = end
+                            break
+                        state["need"] = 0
                         try:
-                            command_str = buffer.decode('utf-8')
-                            if not command_str.strip():
-                                self.log("warning", "Empty JSON after buffer decode")
-                                error_response = {
-                                    "status": "error",
-                                    "message": "Empty request received from client"
-                                }
-                                client.sendall(json.dumps(error_response).encode('utf-8'))
-                                buffer = b''
-                                continue
-                            
-                            command = json.loads(command_str)
-                            buffer = b''
-                            
-                            self.log("info", f"Received command: {json.dumps(command, indent=2)}")
-                        except json.JSONDecodeError as e:
-                            # Only handle complete but invalid JSON - if it's incomplete, wait for more data
-                            if buffer.endswith(b'}') or buffer.endswith(b']'):
-                                self.log("warning", f"Invalid JSON received: {str(e)}")
-                                error_response = {
-                                    "status": "error",
-                                    "message": f"Invalid JSON received: {str(e)}"
-                                }
-                                client.sendall(json.dumps(error_response).encode('utf-8'))
-                                buffer = b''
-                                continue
-                            else:
-                                # Incomplete JSON, wait for more data
-                                continue
-                        
-                        # Validate command format
-                        if not isinstance(command, dict):
-                            self.log("warning", f"Command is not a dictionary: {command}")
-                            error_response = {
-                                "status": "error",
-                                "message": "Invalid command format: expected JSON object"
-                            }
-                            client.sendall(json.dumps(error_response).encode('utf-8'))
-                            continue
-                        
-                        if "type" not in command:
-                            self.log("warning", f"Command missing 'type' field: {command}")
-                            error_response = {
+                            command = _loads(buffer[_HEADER.size:end])
+                        except ValueError as e:
+                            self.log("warning", "Invalid JSON received: %s", e)
+                            self._send(client, _dumps({
                                 "status": "error",
-                                "message": "Invalid command format: missing 'type' field"
-                            }
-                            client.sendall(json.dumps(error_response).encode('utf-8'))
+                                "message": f"Invalid JSON received: {str(e)}"
+                            }))
+                            del buffer[:end]
                             continue
-                        
-                        # If command_executor is available, use it to execute the command
-                        if self.command_executor:
-                            try:
-                                # Execute the command
-                                response = self.command_executor(command)
-                                
-                                # Ensure the response is a properly formatted dictionary
-                                if not isinstance(response, dict):
-                                    self.log("warning", f"Response is not a dictionary: {response}")
-                                    response = {
-                                        "status": "error",
-                                        "message": f"Invalid response format: {str(response)}"
-                                    }
-                                
-                                # Ensure the response has a status field
-                                if "status" not in response:
-                                    self.log("warning", f"Response missing status field: {response}")
-                                    if "error" in response:
-                                        # Convert old error format to new status format
-                                        response = {
-                                            "status": "error",
-                                            "message": response["error"]
-                                        }
-                                    else:
-                                        # Add a default success status
-                                        response["status"] = "success"
-                                
-                                # Ensure there's a message field
-                                if "message" not in response and response["status"] == "success":
-                                    self.log("warning", f"Success response missing message field: {response}")
-                                    response["message"] = "Command executed successfully"
-                                
-                                # Convert response to JSON and send
-                                try:
-                                    # Debug print before JSON serialization
-                                    self.log("info", f"Preparing to send response: {response}")
-                                    
-                                    response_json = json.dumps(response)
-                                    # Debug print after JSON serialization
-                                    self.log("info", f"Serialized JSON response: {response_json}")
-                                    
-                                    client.sendall(response_json.encode('utf-8'))
-                                    self.log("info", f"Response sent successfully")
-                                except Exception as e:
-                                    self.log("error", f"Failed to send response: {str(e)}")
-                                    traceback.print_exc()
-                            except Exception as e:
-                                self.log("error", f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    error_json = json.dumps(error_response)
-                                    self.log("info", f"Sending error response: {error_json}")
-                                    client.sendall(error_json.encode('utf-8'))
-                                except Exception as send_err:
-                                    self.log("error", f"Failed to send error response: {str(send_err)}")
-                                    traceback.print_exc()
-                        else:
-                            # If no command executor is available, return an error
-                            self.log("error", "No command executor available")
-                            error_response = {
-                                "status": "error",
-                                "message": "Server is not configured to execute commands"
-                            }
-                            client.sendall(json.dumps(error_response).encode('utf-8'))
-                    except Exception as e:
-                        # Handle any other exception in the command processing logic
-                        self.log("error", f"Error processing command: {str(e)}")
-                        traceback.print_exc()
-                        try:
-                            error_response = {
-                                "status": "error",
-                                "message": f"Error processing command: {str(e)}"
-                            }
-                            client.sendall(json.dumps(error_response).encode('utf-8'))
-                        except Exception as send_err:
-                            self.log("error", f"Failed to send error response: {str(send_err)}")
-                except Exception as e:
-                    self.log("error", f"Error receiving data: {str(e)}")
-                    traceback.print_exc()
+                        del buffer[:end]
+                        self._log_command(command)
+                        self._process_command(client, command)
+                        continue
+                    state["framed"] = False
+                    if buffer[0] not in _JSON_OPENERS:
+                        self.log("warning", "Invalid JSON received: expected an object")
+                        self._send(client, _NOT_AN_OBJECT_RESPONSE)
+                        buffer.clear()
+                        break
+                
+                # Only parse once the brackets balance; until then keep the scan position
+                scan, depth, in_string = _scan_json(buffer, state["scan"], len(buffer), state["depth"], state["in_string"])
+                if depth:
+                    # Incomplete JSON, wait for more data
+                    state["scan"], state["depth"], state["in_string"] = scan, depth, in_string
                     break
+                state["scan"], state["depth"], state["in_string"] = 0, 0, False
+                
+                try:
+                    command = _loads(buffer[:scan])
+                except ValueError as e:
+                    # Complete but invalid JSON; drop just this message
+                    self.log("warning", "Invalid JSON received: %s", e)
+                    error_response = {
+                        "status": "error",
+                        "message": f"Invalid JSON received: {str(e)}"
+                    }
+                    self._send(client, _dumps(error_response))
+                    del buffer[:scan]
+                    continue
+                
+                # Drop only the bytes of this command
+                del buffer[:scan]
+                
+                self._log_command(command)
+                self._process_command(client, command)
         except Exception as e:
-            self.log("error", f"Error in client handler: {str(e)}")
-            traceback.print_exc()
-        finally:
+            # Handle any other exception in the command processing logic
+            self.log("error", "Error processing command: %s", e)
+            buffer.clear()
+            state["scan"], state["depth"], state["in_string"] = 0, 0, False
+            state["need"] = 0
+            self.logger.debug("Command processing failure", exc_info=True)
             try:
-                client.close()
-            except:
-                pass
-            self.log("info", "Client handler stopped") 
\ No newline at end of file
+                error_response = {
+                    "status": "error",
+                    "message": f"Error processing command: {str(e)}",
+                    "exc_type": type(e).__name__
+                }
+                self._send(client, _dumps(error_response))
+            except Exception as send_err:
+                self.log("error", "Failed to send error response: %s", send_err)
+    
+    def _log_command(self, command):
+        """Log a received command; the whole command is formatted only when DEBUG is on"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.log("debug", "Received command: %s", json.dumps(command, indent=2))
+        elif isinstance(command, dict):
+            self.log("info", "Received command: %s", command.get('type'))
+    
+    def _process_command(self, client, command):
+        """Validate and execute one parsed command and send its response"""
+        # Validate command format
+        if not isinstance(command, dict):
+            self.log("warning", "Command is not a dictionary: %s", command)
+            self._send(client, _NOT_A_DICT_RESPONSE)
+            return
+        
+        if "type" not in command:
+            self.log("warning", "Command missing 'type' field: %s", command)
+            self._send(client, _MISSING_TYPE_RESPONSE)
+            return
+        
+        # If command_executor is available, use it to execute the command
+        if self.command_executor:
+            try:
+                # Execute the command
+                response = self.command_executor(command)
+                
+                # Send pre-serialized payloads as-is instead of re-encoding them
+                payload = response.pop(SERIALIZED_RESPONSE_KEY, None) if isinstance(response, dict) else None
+                if payload is not None:
+                    self._send(client, payload)
+                    self.log("debug", "Response sent successfully")
+                    return
+                
+                # Ensure the response is a properly formatted dictionary
+                if not isinstance(response, dict):
+                    self.log("warning", "Response is not a dictionary: %s", response)
+                    response = {
+                        "status": "error",
+                        "message": f"Invalid response format: {str(response)}"
+                    }
+                
+                # Ensure the response has a status field
+                if "status" not in response:
+                    self.log("warning", "Response missing status field: %s", response)
+                    if "error" in response:
+                        # Convert old error format to new status format
+                        response = {
+                            "status": "error",
+                            "message": response["error"]
+                        }
+                    else:
+                        # Add a default success status
+                        response["status"] = "success"
+                
+                # Ensure there's a message field
+                if "message" not in response and response["status"] == "success":
+                    self.log("warning", "Success response missing message field: %s", response)
+                    response["message"] = "Command executed successfully"
+                
+                # Convert response to JSON and send
+                try:
+                    # Debug print before JSON serialization; %s defers the repr of large responses
+                    self.log("debug", "Preparing to send response: %s", response)
+                    
+                    response_json = _dumps(response)
+                    # Debug print after JSON serialization
+                    self.log("debug", "Serialized JSON response (%d bytes)", len(response_json))
+                    
+                    self._send(client, response_json)
+                    self.log("debug", "Response sent successfully")
+                except Exception as e:
+                    self.log("error", "Failed to send response: %s", e)
+                    self.logger.debug("Response send failure", exc_info=True)
+            except Exception as e:
+                self.log("error", "Error executing command: %s", e)
+                self.logger.debug("Command execution failure", exc_info=True)
+                try:
+                    error_response = {
+                        "status": "error",
+                        "message": str(e),
+                        "exc_type": type(e).__name__
+                    }
+                    error_json = _dumps(error_response)
+                    self.log("debug", "Sending error response: %s", error_response)
+                    self._send(client, error_json)
+                except Exception as send_err:
+                    self.log("error", "Failed to send error response: %s", send_err)
+        else:
+            # If no command executor is available, return an error
+            self.log("error", "No command executor available")
+            self._send(client, _NO_EXECUTOR_RESPONSE)
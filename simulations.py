@@ -1,11 +1,11 @@
 try:
     import hou
+    HAS_HOU = True
 except ImportError:
-    # Create a dummy version for when running outside Houdini
-    class DummyHou:
-        def __getattr__(self, name):
-            return lambda *args, **kwargs: None
-    hou = DummyHou()
+    # Outside Houdini every builder returns an error up front instead of
+    # walking its body against a stub
+    hou = None
+    HAS_HOU = False
 
 import traceback
 import logging
@@ -13,6 +13,24 @@ from typing import Dict, Any, List, Optional, Union
 
 logger = logging.getLogger("HoudiniMCP.Simulations")
 
+# Component parameter names, zipped with [x, y, z] values so each node's
+# parameters are set in one setParms call instead of one parm() lookup each
+_TRANSLATE_PARMS = ("tx", "ty", "tz")
+_SIZE_PARMS = ("sizex", "sizey", "sizez")
+_ROTATE_PARMS = ("rx", "ry", "rz")
+_WIND_PARMS = ("windx", "windy", "windz")
+
+def _houdini_unavailable() -> Dict[str, Any]:
+    """Response for simulation commands issued outside Houdini"""
+    return {
+        "status": "error",
+        "message": "Houdini not available"
+    }
+
+def _radius(size: Union[float, List[float]]) -> float:
+    """Sphere radius from a size given either as a number or as a list"""
+    return size if isinstance(size, (int, float)) else size[0]
+
 def create_fluid_simulation(params: Dict[str, Any], logger_instance: Optional[logging.Logger] = None) -> Dict[str, Any]:
     """
     Create a FLIP fluid simulation with the specified parameters
@@ -36,6 +54,9 @@ def create_fluid_simulation(params: Dict[str, Any], logger_instance: Optional[lo
     Returns:
         Dictionary with simulation creation status and node path
     """
+    if not HAS_HOU:
+        return _houdini_unavailable()
+    
     if logger_instance:
         log = logger_instance
     else:
@@ -55,80 +76,71 @@ def create_fluid_simulation(params: Dict[str, Any], logger_instance: Optional[lo
         frame_range = params.get("frame_range", [1, 100])
         collision_objects = params.get("collision_objects", [])
         
-        # Create a geometry node to contain the simulation
-        obj_context = hou.node("/obj")
-        fluid_container = obj_context.createNode("geo", "fluid_sim")
-        
-        # Create the container
-        dopnet = fluid_container.createNode("dopnet", "fluid_simulation")
-        
-        # Create FLIP solver
-        flip_solver = dopnet.createNode("flipsolver", "flip_solver")
-        
-        # Create container source
-        fluid_source = dopnet.createNode("fluidsource", "fluid_source")
-        
-        # Configure the solver 
-        # - These are common parameters that might need adjustment based on the simulation
-        flip_solver.parm("viscosity").set(viscosity)
-        flip_solver.parm("surfacetension").set(surface_tension)
-        
-        # Set up container geometry
-        fluid_container.parm("rx").set(container_size[0])
-        fluid_container.parm("ry").set(container_size[1])
-        fluid_container.parm("rz").set(container_size[2])
-        
-        # Configure the source based on type
-        if source_type == "box":
-            # Set up box source
-            fluid_source.parm("sourcetype").set(0)  # 0 = box
-            fluid_source.parm("sizex").set(source_size[0])
-            fluid_source.parm("sizey").set(source_size[1])
-            fluid_source.parm("sizez").set(source_size[2])
-        else:
-            # Set up sphere source
-            fluid_source.parm("sourcetype").set(1)  # 1 = sphere
-            fluid_source.parm("radius").set(source_size if isinstance(source_size, (int, float)) else source_size[0])
-        
-        fluid_source.parm("tx").set(source_position[0])
-        fluid_source.parm("ty").set(source_position[1])
-        fluid_source.parm("tz").set(source_position[2])
-        
-        # Connect everything
-        fluid_source.setInput(0, flip_solver)
-        
-        # Add collisions if specified
-        for i, collision in enumerate(collision_objects):
-            coll_type = collision.get("type", "sphere")
-            coll_position = collision.get("position", [0, 0, 0])
-            coll_size = collision.get("size", [1, 1, 1] if coll_type == "box" else 1)
+        # One undo step for the whole network rather than one per node and parameter
+        with hou.undos.group("MCP create fluid simulation"):
+            # Create a geometry node to contain the simulation
+            obj_context = hou.node("/obj")
+            fluid_container = obj_context.createNode("geo", "fluid_sim")
+            
+            # Create the container
+            dopnet = fluid_container.createNode("dopnet", "fluid_simulation")
+            
+            # Create FLIP solver
+            flip_solver = dopnet.createNode("flipsolver", "flip_solver")
             
-            # Create collision node
-            collision_node = dopnet.createNode("staticobject", f"collision_{i}")
+            # Create container source
+            fluid_source = dopnet.createNode("fluidsource", "fluid_source")
             
-            if coll_type == "box":
-                collision_node.parm("geotype").set(0)  # 0 = box
-                collision_node.parm("sizex").set(coll_size[0])
-                collision_node.parm("sizey").set(coll_size[1])
-                collision_node.parm("sizez").set(coll_size[2])
+            # Configure the solver 
+            # - These are common parameters that might need adjustment based on the simulation
+            flip_solver.setParms({"viscosity": viscosity, "surfacetension": surface_tension})
+            
+            # Set up container geometry
+            fluid_container.setParms(dict(zip(_ROTATE_PARMS, container_size)))
+            
+            # Configure the source based on type
+            source_parms = dict(zip(_TRANSLATE_PARMS, source_position))
+            if source_type == "box":
+                # Set up box source
+                source_parms["sourcetype"] = 0  # 0 = box
+                source_parms.update(zip(_SIZE_PARMS, source_size))
             else:
-                collision_node.parm("geotype").set(2)  # 2 = sphere
-                collision_node.parm("radius").set(coll_size if isinstance(coll_size, (int, float)) else coll_size[0])
+                # Set up sphere source
+                source_parms["sourcetype"] = 1  # 1 = sphere
+                source_parms["radius"] = _radius(source_size)
+            fluid_source.setParms(source_parms)
+            
+            # Connect everything
+            fluid_source.setInput(0, flip_solver)
+            
+            # Add collisions if specified
+            for i, collision in enumerate(collision_objects):
+                coll_type = collision.get("type", "sphere")
+                coll_position = collision.get("position", [0, 0, 0])
+                coll_size = collision.get("size", [1, 1, 1] if coll_type == "box" else 1)
+                
+                # Create collision node
+                collision_node = dopnet.createNode("staticobject", f"collision_{i}")
+                
+                coll_parms = dict(zip(_TRANSLATE_PARMS, coll_position))
+                if coll_type == "box":
+                    coll_parms["geotype"] = 0  # 0 = box
+                    coll_parms.update(zip(_SIZE_PARMS, coll_size))
+                else:
+                    coll_parms["geotype"] = 2  # 2 = sphere
+                    coll_parms["radius"] = _radius(coll_size)
+                collision_node.setParms(coll_parms)
                 
-            collision_node.parm("tx").set(coll_position[0])
-            collision_node.parm("ty").set(coll_position[1])
-            collision_node.parm("tz").set(coll_position[2])
+                # Connect to solver
+                collision_node.setInput(0, flip_solver)
+                
+            # Set playback range
+            hou.playbar.setPlaybackRange(frame_range[0], frame_range[1])
             
-            # Connect to solver
-            collision_node.setInput(0, flip_solver)
+            # Layout the nodes
+            dopnet.layoutChildren()
+            fluid_container.layoutChildren()
             
-        # Set playback range
-        hou.playbar.setPlaybackRange(frame_range[0], frame_range[1])
-        
-        # Layout the nodes
-        dopnet.layoutChildren()
-        fluid_container.layoutChildren()
-        
         # Return success
         return {
             "status": "success",
@@ -167,6 +179,9 @@ def create_pyro_simulation(params: Dict[str, Any], logger_instance: Optional[log
     Returns:
         Dictionary with simulation creation status and node path
     """
+    if not HAS_HOU:
+        return _houdini_unavailable()
+    
     if logger_instance:
         log = logger_instance
     else:
@@ -189,62 +204,60 @@ def create_pyro_simulation(params: Dict[str, Any], logger_instance: Optional[log
         wind_speed = params.get("wind_speed", 0.0)
         frame_range = params.get("frame_range", [1, 100])
         
-        # Create a geometry node to contain the simulation
-        obj_context = hou.node("/obj")
-        pyro_container = obj_context.createNode("geo", "pyro_sim")
-        
-        # Create the pyro setup
-        # Use the Pyro FX shelf tool through Python to set up the basic simulation
-        pyro_node = pyro_container.createNode("pyrosolver", "pyro_solver")
-        
-        # Create source
-        source_node = pyro_container.createNode("smokeobject", "pyro_source")
-        
-        # Configure the source based on type
-        if source_type == "box":
-            source_node.parm("primtype").set(0)  # 0 = box
-            source_node.parm("sizex").set(source_size[0])
-            source_node.parm("sizey").set(source_size[1])
-            source_node.parm("sizez").set(source_size[2])
-        else:
-            source_node.parm("primtype").set(2)  # 2 = sphere
-            source_node.parm("radius").set(source_size if isinstance(source_size, (int, float)) else source_size[0])
+        # One undo step for the whole network rather than one per node and parameter
+        with hou.undos.group("MCP create pyro simulation"):
+            # Create a geometry node to contain the simulation
+            obj_context = hou.node("/obj")
+            pyro_container = obj_context.createNode("geo", "pyro_sim")
             
-        source_node.parm("tx").set(source_position[0])
-        source_node.parm("ty").set(source_position[1])
-        source_node.parm("tz").set(source_position[2])
-        
-        # Set source parameters
-        source_node.parm("temperature").set(temperature)
-        source_node.parm("fuel").set(fuel)
-        
-        # Set solver parameters
-        pyro_node.parm("divsize").set(0.1)  # Resolution - smaller is higher resolution
-        pyro_node.parm("burningrate").set(burn_rate)
-        pyro_node.parm("expansionrate").set(expansion)
-        pyro_node.parm("cooling").set(cooling_rate)
-        
-        # Set turbulence
-        turb_node = pyro_container.createNode("gasturb", "turbulence")
-        turb_node.parm("amp").set(turbulence)
-        
-        # Add wind if specified
-        if wind_speed > 0:
-            wind_node = pyro_container.createNode("gasupres", "wind")
-            wind_node.parm("windx").set(wind_direction[0] * wind_speed)
-            wind_node.parm("windy").set(wind_direction[1] * wind_speed)
-            wind_node.parm("windz").set(wind_direction[2] * wind_speed)
+            # Create the pyro setup
+            # Use the Pyro FX shelf tool through Python to set up the basic simulation
+            pyro_node = pyro_container.createNode("pyrosolver", "pyro_solver")
+            
+            # Create source
+            source_node = pyro_container.createNode("smokeobject", "pyro_source")
+            
+            # Configure the source based on type
+            source_parms = dict(zip(_TRANSLATE_PARMS, source_position))
+            if source_type == "box":
+                source_parms["primtype"] = 0  # 0 = box
+                source_parms.update(zip(_SIZE_PARMS, source_size))
+            else:
+                source_parms["primtype"] = 2  # 2 = sphere
+                source_parms["radius"] = _radius(source_size)
+            
+            # Set source parameters
+            source_parms["temperature"] = temperature
+            source_parms["fuel"] = fuel
+            source_node.setParms(source_parms)
+            
+            # Set solver parameters
+            pyro_node.setParms({
+                "divsize": 0.1,  # Resolution - smaller is higher resolution
+                "burningrate": burn_rate,
+                "expansionrate": expansion,
+                "cooling": cooling_rate
+            })
+            
+            # Set turbulence
+            turb_node = pyro_container.createNode("gasturb", "turbulence")
+            turb_node.parm("amp").set(turbulence)
+            
+            # Add wind if specified
+            if wind_speed > 0:
+                wind_node = pyro_container.createNode("gasupres", "wind")
+                wind_node.setParms({name: component * wind_speed for name, component in zip(_WIND_PARMS, wind_direction)})
+                
+            # Connect nodes
+            # Basic connection for demonstration - actual connections would depend on complex node graph
+            source_node.setInput(0, pyro_node)
+            
+            # Set playback range
+            hou.playbar.setPlaybackRange(frame_range[0], frame_range[1])
+            
+            # Layout the nodes
+            pyro_container.layoutChildren()
             
-        # Connect nodes
-        # Basic connection for demonstration - actual connections would depend on complex node graph
-        source_node.setInput(0, pyro_node)
-        
-        # Set playback range
-        hou.playbar.setPlaybackRange(frame_range[0], frame_range[1])
-        
-        # Layout the nodes
-        pyro_container.layoutChildren()
-        
         # Return success
         return {
             "status": "success",
@@ -276,6 +289,9 @@ def run_simulation(params: Dict[str, Any], logger_instance: Optional[logging.Log
     Returns:
         Dictionary with simulation status information
     """
+    if not HAS_HOU:
+        return _houdini_unavailable()
+    
     if logger_instance:
         log = logger_instance
     else:
@@ -17,6 +17,9 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("BlenderMCPServer")
 
+# Longest prefix of command params written to the log
+LOG_PARAMS_LIMIT = 200
+
 @dataclass
 class BlenderConnection:
     host: str
@@ -29,8 +32,9 @@ class BlenderConnection:
             return True
             
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
+            self.sock = socket.create_connection((self.host, self.port), timeout=15.0)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
             logger.info(f"Connected to Blender at {self.host}:{self.port}")
             return True
         except Exception as e:
@@ -48,34 +52,46 @@ class BlenderConnection:
             finally:
                 self.sock = None
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
+    def receive_full_response(self, sock, buffer_size=65536):
+        """Receive the complete response, potentially in multiple chunks, into one growing buffer"""
+        buf = bytearray(buffer_size)
+        view = memoryview(buf)
+        received = 0
         # Use a consistent timeout value that matches the addon's timeout
         sock.settimeout(15.0)  # Match the addon's timeout
         
         try:
             while True:
                 try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
+                    if received == len(buf):
+                        # Double the buffer; the view must be released before it can resize
+                        view.release()
+                        buf.extend(bytes(len(buf)))
+                        view = memoryview(buf)
+                    
+                    n = sock.recv_into(view[received:])
+                    if not n:
                         # If we get an empty chunk, the connection might be closed
-                        if not chunks:  # If we haven't received anything yet, this is an error
+                        if not received:  # If we haven't received anything yet, this is an error
                             raise Exception("Connection closed before receiving any data")
                         break
+                    received += n
                     
-                    chunks.append(chunk)
+                    # A response is a JSON object, so it can only be complete once the
+                    # data ends in '}'; skip the parse attempt otherwise
+                    if buf[received - 1] != 0x7D:
+                        continue
                     
                     # Check if we've received a complete JSON object
                     try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        # If we get here, it parsed successfully
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
+                        json.loads(buf[:received])
                     except json.JSONDecodeError:
                         # Incomplete JSON, continue receiving
                         continue
+                    logger.info(f"Received complete response ({received} bytes)")
+                    view.release()
+                    del buf[received:]
+                    return buf
                 except socket.timeout:
                     # If we hit a timeout during receiving, break the loop and try to use what we have
                     logger.warning("Socket timeout during chunked receive")
@@ -91,13 +107,14 @@ class BlenderConnection:
             
         # If we get here, we either timed out or broke out of the loop
         # Try to use what we have
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
+        if received:
+            view.release()
+            del buf[received:]
+            logger.info(f"Returning data after receive completion ({received} bytes)")
             try:
                 # Try to parse what we have
-                json.loads(data.decode('utf-8'))
-                return data
+                json.loads(buf)
+                return buf
             except json.JSONDecodeError:
                 # If we can't parse it, it's incomplete
                 raise Exception("Incomplete JSON response received")
@@ -116,21 +133,23 @@ class BlenderConnection:
         
         try:
             # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
+            if logger.isEnabledFor(logging.INFO):
+                # Params can carry whole scripts; only log a prefix
+                logger.info("Sending command: %s with params: %s", command_type, repr(params)[:LOG_PARAMS_LIMIT])
             
             # Send the command
             self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
+            logger.info("Command sent, waiting for response...")
             
             # Set a timeout for receiving - use the same timeout as in receive_full_response
             self.sock.settimeout(15.0)  # Match the addon's timeout
             
             # Receive the response using the improved receive_full_response method
             response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
+            logger.info("Received %d bytes of data", len(response_data))
             
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+            response = json.loads(response_data)
+            logger.info("Response parsed, status: %s", response.get('status', 'unknown'))
             
             if response.get("status") == "error":
                 logger.error(f"Blender error: {response.get('message')}")
@@ -1,11 +1,12 @@
 from mcp.server.fastmcp import FastMCP, Context, Image
 import socket
+import struct
 import json
 import asyncio
 import logging
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
 import os
 from pathlib import Path
 import traceback
@@ -15,6 +16,12 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("HoudiniMCPServer")
 
+# Longest prefix of command params written to the log
+LOG_PARAMS_LIMIT = int(os.environ.get("HOUDINI_MCP_LOG_PARAMS", "200"))
+
+# Every message on the plugin socket is prefixed with its length as a 4-byte big-endian integer
+_HEADER = struct.Struct(">I")
+
 @dataclass
 class HoudiniConnection:
     host: str
@@ -27,9 +34,13 @@ class HoudiniConnection:
             return True
             
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Houdini at {self.host}:{self.port}")
+            # create_connection resolves the host with getaddrinfo, so IPv6 hosts work too
+            self.sock = socket.create_connection((self.host, self.port), timeout=15.0)
+            # Commands are small request/response messages; don't let Nagle delay them
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # The connection is long-lived, so let the OS notice a vanished peer
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            logger.info("Connected to Houdini at %s:%d", self.host, self.port)
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Houdini: {str(e)}")
@@ -46,61 +57,42 @@ class HoudiniConnection:
             finally:
                 self.sock = None
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
+    def _recv_exactly(self, sock, size):
+        """Read exactly size bytes from the socket into a preallocated buffer"""
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = sock.recv_into(view[received:])
+            if not n:
+                raise ConnectionError(f"Connection closed after {received} of {size} bytes")
+            received += n
+        return buf
+
+    def _send_frame(self, sock, payload):
+        """Send one length-prefixed message without joining the header and body"""
+        header = _HEADER.pack(len(payload))
+        if not hasattr(sock, "sendmsg"):
+            # No scatter-gather on Windows
+            sock.sendall(header)
+            sock.sendall(payload)
+            return
+        sent = sock.sendmsg([header, payload])
+        if sent < len(header):
+            sock.sendall(header[sent:])
+            sent = len(header)
+        if sent < len(header) + len(payload):
+            sock.sendall(memoryview(payload)[sent - len(header):])
+
+    def receive_full_response(self, sock):
+        """Receive one length-prefixed response (4-byte big-endian length, then the JSON body)"""
         # Set timeout for receiving data
         sock.settimeout(15.0)  # 15 seconds timeout
         
-        try:
-            while True:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        # If we get an empty chunk, the connection might be closed
-                        if not chunks:  # If we haven't received anything yet, this is an error
-                            raise Exception("Connection closed before receiving any data")
-                        break
-                    
-                    chunks.append(chunk)
-                    
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        # If we get here, it parsed successfully
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    # If we hit a timeout during receiving, break the loop and try to use what we have
-                    logger.warning("Socket timeout during chunked receive")
-                    break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise  # Re-raise to be handled by the caller
-        except socket.timeout:
-            logger.warning("Socket timeout during chunked receive")
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-            
-        # If we get here, we either timed out or broke out of the loop
-        # Try to use what we have
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
-            try:
-                # Try to parse what we have
-                json.loads(data.decode('utf-8'))
-                return data
-            except json.JSONDecodeError:
-                # If we can't parse it, it's incomplete
-                raise Exception("Incomplete JSON response received")
-        else:
-            raise Exception("No data received")
+        (length,) = _HEADER.unpack(self._recv_exactly(sock, _HEADER.size))
+        data = self._recv_exactly(sock, length)
+        logger.debug("Received complete response (%d bytes)", length)
+        return data
 
     def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Send a command to Houdini and return the response"""
@@ -114,21 +106,24 @@ class HoudiniConnection:
         
         try:
             # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
+            if logger.isEnabledFor(logging.INFO):
+                # Params can carry whole scripts; only log a prefix
+                logger.info("Sending command: %s with params: %s", command_type, repr(params)[:LOG_PARAMS_LIMIT])
             
             # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
+            payload = json.dumps(command).encode('utf-8')
+            self._send_frame(self.sock, payload)
+            logger.info("Command sent, waiting for response...")
             
             # Set a timeout for receiving
             self.sock.settimeout(15.0)  # 15 seconds timeout
             
             # Receive the response using the improved receive_full_response method
             response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
+            logger.info("Received %d bytes of data", len(response_data))
             
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+            response = json.loads(response_data)
+            logger.info("Response parsed, status: %s", response.get('status', 'unknown'))
             
             if response.get("status") == "error":
                 logger.error(f"Houdini error: {response.get('message')}")
@@ -168,7 +163,7 @@ def get_houdini_connection() -> HoudiniConnection:
         host = os.environ.get("HOUDINI_MCP_HOST", "localhost")
         port = int(os.environ.get("HOUDINI_MCP_PORT", "9876"))
         
-        logger.info(f"Creating new Houdini connection to {host}:{port}")
+        logger.info("Creating new Houdini connection to %s:%d", host, port)
         _houdini_connection = HoudiniConnection(host=host, port=port)
     
     # Ensure connection is active
@@ -192,7 +187,7 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
             houdini = get_houdini_connection()
             logger.info("Successfully connected to Houdini on startup")
         except Exception as e:
-            logger.warning(f"Could not connect to Houdini on startup: {str(e)}")
+            logger.warning("Could not connect to Houdini on startup: %s", e)
             logger.warning("Make sure the Houdini plugin is running before using Houdini resources or tools")
         
         # Return an empty context - we're using the global connection
@@ -225,18 +220,19 @@ def get_scene_info() -> Dict[str, Any]:
     - Frame rate
     - Current frame
     - Playback range
-    - List of top-level objects
+    - Top-level objects, as parallel "names", "types" and "paths" lists
     """
     houdini = get_houdini_connection()
     return houdini.send_command("get_scene_info")
 
 @mcp.resource()
-def get_object_info(object_name: str) -> Dict[str, Any]:
+def get_object_info(object_name: str, parm_filter: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Get detailed information about a specific object in the Houdini scene
     
     Parameters:
     - object_name: The name or path of the object to get information about
+    - parm_filter: Glob pattern or list of parameter names to include (optional, default: all)
     
     Returns detailed information about the specified object, including:
     - Node type
@@ -245,7 +241,10 @@ def get_object_info(object_name: str) -> Dict[str, Any]:
     - Parameters and their values
     """
     houdini = get_houdini_connection()
-    return houdini.send_command("get_object_info", {"object_name": object_name})
+    params = {"object_name": object_name}
+    if parm_filter:
+        params["parm_filter"] = parm_filter
+    return houdini.send_command("get_object_info", params)
 
 # Tool endpoints
 
@@ -487,6 +486,10 @@ def execute_houdini_code(code: str) -> Dict[str, Any]:
     Parameters:
     - code: The Python code to execute in Houdini
     
+    Tight numeric loops (e.g. over point positions pulled into lists or numpy arrays) can be
+    decorated with @njit to compile them with Numba when it is installed in Houdini; without
+    Numba the decorator is a no-op.
+    
     Warning: This allows running arbitrary code in Houdini. Use with caution!
     """
     houdini = get_houdini_connection()
@@ -0,0 +1,219 @@
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commands import CommandExecutor, SERIALIZED_RESPONSE_KEY
+
+class TestCommandExecutor(unittest.TestCase):
+    """Test cases for the command executor"""
+
+    def setUp(self):
+        """Create a fresh executor"""
+        self.executor = CommandExecutor()
+        
+    def test_list_available_commands(self):
+        """Test that all registered handlers are listed"""
+        response = self.executor.execute_command({"type": "list_available_commands"})
+        
+        self.assertEqual(response["status"], "success")
+        self.assertIn("create_node", response["commands"])
+        self.assertEqual(len(response["commands"]), len(self.executor.command_handlers))
+        
+    def test_unknown_command(self):
+        """Test that unknown command types are rejected"""
+        response = self.executor.execute_command({"type": "does_not_exist"})
+        
+        self.assertEqual(response["status"], "error")
+        self.assertIn("Unknown command type", response["message"])
+        
+    def test_response_is_serialized_once(self):
+        """Test that the serialized payload matches the returned response"""
+        response = self.executor.execute_command({
+            "type": "execute_houdini_code",
+            "params": {"code": "answer = 42"}
+        })
+        
+        payload = response.pop(SERIALIZED_RESPONSE_KEY)
+        self.assertEqual(json.loads(payload), response)
+        
+    @patch('commands.hou')
+    def test_create_node(self, mock_hou):
+        """Test node creation under a parent"""
+        mock_hou.node.return_value.createNode.return_value.path.return_value = "/obj/test_geo"
+        
+        response = self.executor.execute_command({
+            "type": "create_node",
+            "params": {"parent_path": "/obj", "node_type": "geo", "node_name": "test_geo"}
+        })
+        
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["node_path"], "/obj/test_geo")
+        mock_hou.node.assert_called_once_with("/obj")
+        mock_hou.node.return_value.createNode.assert_called_once_with("geo", "test_geo")
+        
+    @patch('commands.hou')
+    def test_node_lookups_are_cached(self, mock_hou):
+        """Test that repeated lookups of the same path reuse the node"""
+        mock_hou.node.return_value.path.return_value = "/obj"
+        command = {"type": "create_node", "params": {"parent_path": "/obj", "node_type": "geo"}}
+        
+        self.executor.execute_command(command)
+        self.executor.execute_command(command)
+        
+        mock_hou.node.assert_called_once_with("/obj")
+        
+    @patch('commands.NODE_CACHE_SIZE', 2)
+    @patch('commands.hou')
+    def test_node_cache_evicts_least_recently_used(self, mock_hou):
+        """Test that the node cache stays bounded and keeps recently used paths"""
+        mock_hou.node.side_effect = lambda path: MagicMock(**{"path.return_value": path})
+        
+        for path in ("/obj/a", "/obj/b", "/obj/a", "/obj/c"):
+            self.executor._resolve_node(path)
+        
+        self.assertEqual(list(self.executor._node_cache), ["/obj/a", "/obj/c"])
+        
+    def test_create_node_missing_type(self):
+        """Test node creation without a node type"""
+        response = self.executor.execute_command({"type": "create_node", "params": {}})
+        
+        self.assertEqual(response["status"], "error")
+        self.assertIn("node_type", response["message"])
+
+    def test_execute_houdini_code(self):
+        """Test that code snippets run and report their local variables"""
+        command = {"type": "execute_houdini_code", "params": {"code": "x = 1 + 2"}}
+        
+        first = self.executor.execute_command(command)
+        second = self.executor.execute_command(command)
+        
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(first["variables"], {"x": "3"})
+        self.assertEqual(second["variables"], {"x": "3"})
+
+    @patch('commands.hou')
+    def test_get_object_info_reads_params(self, mock_hou):
+        """Test that get_object_info looks the node up by the name in params"""
+        mock_hou.node.return_value = None
+        
+        response = self.executor.execute_command({
+            "type": "get_object_info",
+            "params": {"object_name": "/obj/missing"}
+        })
+        
+        self.assertEqual(response["status"], "error")
+        self.assertEqual(response["message"], "Node not found: /obj/missing")
+        mock_hou.node.assert_called_once_with("/obj/missing")
+
+    @patch('commands.hou')
+    def test_get_scene_info(self, mock_hou):
+        """Test that scene info reads the playback range once and lists context children"""
+        mock_hou.hipFile.name.return_value = "scene.hip"
+        mock_hou.fps.return_value = 24.0
+        mock_hou.frame.return_value = 1.0
+        mock_hou.playbar.playbackRange.return_value = (1.0, 240.0)
+        child = MagicMock()
+        child.name.return_value = "geo1"
+        mock_hou.node.return_value.children.return_value = [child]
+        
+        response = self.executor.execute_command({"type": "get_scene_info"})
+        
+        self.assertEqual(response["status"], "success")
+        self.assertEqual((response["start_frame"], response["end_frame"]), (1.0, 240.0))
+        self.assertEqual(response["top_nodes"][0], {"context": "obj", "nodes": ["geo1"]})
+        mock_hou.playbar.playbackRange.assert_called_once_with()
+
+    @patch('commands.hou')
+    def test_get_object_info_skips_hidden_parms(self, mock_hou):
+        """Test that hidden parameters are only evaluated when include_hidden is set"""
+        visible, hidden = MagicMock(), MagicMock()
+        visible.name.return_value, hidden.name.return_value = "tx", "internal"
+        visible.isHidden.return_value, hidden.isHidden.return_value = False, True
+        node = mock_hou.node.return_value
+        node.parmTuples.return_value = [visible, hidden]
+        node.path.return_value = "/obj/geo1"
+        
+        response = self.executor.get_object_info({"object_name": "/obj/geo1"})
+        self.assertEqual(response["parameters"]["names"], ["tx"])
+        hidden.parmTemplate.assert_not_called()
+        
+        response = self.executor.get_object_info({"object_name": "/obj/geo1", "include_hidden": True})
+        self.assertEqual(response["parameters"]["names"], ["tx", "internal"])
+
+    @patch('commands.hou')
+    def test_bulk_ops(self, mock_hou):
+        """Test that bulk_ops runs each op in order inside one undo group"""
+        mock_hou.node.return_value.path.return_value = "/obj/geo1"
+        
+        response = self.executor.execute_command({
+            "type": "bulk_ops",
+            "params": {"ops": [
+                {"type": "set_param", "params": {"node_path": "/obj/geo1", "param_name": "tx", "param_value": 1.0}},
+                {"type": "connect_nodes", "params": {"from_path": "/obj/geo1"}},
+                {"type": "bulk_ops", "params": {"ops": []}}
+            ]}
+        })
+        
+        self.assertEqual(response["status"], "error")
+        self.assertEqual(response["message"], "1 of 3 operations succeeded")
+        self.assertEqual([r["status"] for r in response["results"]], ["success", "error", "error"])
+        self.assertEqual(response["results"][1]["message"], "Missing required parameter: to_path")
+        mock_hou.undos.group.assert_called_once_with("MCP bulk")
+        self.assertEqual(json.loads(response[SERIALIZED_RESPONSE_KEY])["results"], response["results"])
+
+    def test_missing_required_params(self):
+        """Test that commands missing required params are rejected before dispatch"""
+        with patch.object(self.executor, 'command_handlers', dict(self.executor.command_handlers)) as handlers:
+            handlers["connect_nodes"] = MagicMock()
+            response = self.executor.execute_command({
+                "type": "connect_nodes",
+                "params": {"from_path": "/obj/a"}
+            })
+            
+            handlers["connect_nodes"].assert_not_called()
+        
+        self.assertEqual(response["status"], "error")
+        self.assertEqual(response["message"], "Missing required parameter: to_path")
+
+    def test_execute_houdini_code_caps_variable_size(self):
+        """Test that large local variables are truncated in the response"""
+        response = self.executor.execute_command({
+            "type": "execute_houdini_code",
+            "params": {"code": "points = list(range(100000))\n_hidden = 1"}
+        })
+        
+        self.assertEqual(response["status"], "success")
+        self.assertNotIn("_hidden", response["variables"])
+        self.assertLess(len(response["variables"]["points"]), 300)
+
+    def test_execute_houdini_code_skips_opaque_reprs(self):
+        """Test that HOM wrappers are reported by type name without calling repr"""
+        class Geometry:
+            def __repr__(self):
+                raise AssertionError("repr should not be called")
+        
+        with patch('commands._OPAQUE_VARIABLE_TYPES', (Geometry,)), patch('commands.hou') as mock_hou:
+            mock_hou.Geometry = Geometry
+            response = self.executor.execute_command({
+                "type": "execute_houdini_code",
+                "params": {"code": "geo = hou.Geometry()"}
+            })
+        
+        self.assertEqual(response["variables"], {"geo": "<Geometry>"})
+
+    def test_non_serializable_response(self):
+        """Test that non-serializable responses are reported with the offending field"""
+        with patch.object(self.executor, 'command_handlers', dict(self.executor.command_handlers)) as handlers:
+            handlers["get_scene_info"] = MagicMock(return_value={"frames": [1, object()]})
+            response = self.executor.execute_command({"type": "get_scene_info"})
+        
+        self.assertEqual(response["status"], "error")
+        self.assertIn("response.frames[1] (object)", response["message"])
+
+if __name__ == '__main__':
+    unittest.main()
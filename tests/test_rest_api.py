@@ -1,13 +1,18 @@
 import unittest
 import json
+import select
+import socket
 import sys
 import os
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
 # Add parent directory to path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from rest_to_socket_proxy import app, send_to_socket, load_command_schema
+import rest_to_socket_proxy
+from rest_to_socket_proxy import app, send_to_socket, load_command_schema, probe_status, SocketPool, PoolExhausted
 
 class TestRestApi(unittest.TestCase):
     """Test cases for the REST API proxy"""
@@ -90,6 +95,26 @@ class TestRestApi(unittest.TestCase):
         self.assertEqual(data["status"], "error")
         self.assertEqual(data["message"], "Missing required field: type")
     
+    @patch('rest_to_socket_proxy.send_to_socket')
+    def test_legacy_run_endpoint(self, mock_send_to_socket):
+        """Test that /houdini/run forwards command/args as type/params"""
+        mock_send_to_socket.return_value = {"status": "success", "message": "ok"}
+        
+        response = self.client.post('/houdini/run',
+            json={"command": "create_node", "args": {"node_type": "geo"}})
+        
+        self.assertEqual(response.status_code, 200)
+        mock_send_to_socket.assert_called_once_with({"type": "create_node", "params": {"node_type": "geo"}})
+    
+    def test_malformed_json_body(self):
+        """Test request whose body is not valid JSON"""
+        response = self.client.post('/mcp/command', data=b'{"type": ',
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
+        data = json.loads(response.data)
+        self.assertEqual(data["message"], "Invalid JSON data received")
+    
     @patch('rest_to_socket_proxy.send_to_socket')
     def test_status_endpoint(self, mock_send_to_socket):
         """Test the status endpoint"""
@@ -109,6 +134,43 @@ class TestRestApi(unittest.TestCase):
         self.assertEqual(data["message"], "Houdini MCP server is running")
         self.assertEqual(data["available_commands"], ["create_node", "set_param"])
     
+    @patch('rest_to_socket_proxy.send_to_socket')
+    def test_concurrent_status_checks_share_one_request(self, mock_send_to_socket):
+        """Test that status checks arriving together send one command to Houdini"""
+        release = threading.Event()
+        def slow_response(command):
+            release.wait(2)
+            return {"status": "success", "commands": ["create_node"]}
+        mock_send_to_socket.side_effect = slow_response
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(probe_status())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(mock_send_to_socket.call_count, 1)
+        self.assertEqual([r["status"] for r in results], ["success"] * 5)
+        
+    @patch('rest_to_socket_proxy.send_to_socket')
+    def test_busy_backend_sets_retry_after(self, mock_send_to_socket):
+        """Test that a saturated pool is reported as 503 with Retry-After"""
+        mock_send_to_socket.return_value = {
+            "status": "error",
+            "code": 503,
+            "message": "Houdini MCP server is busy, retry later",
+            "retry_after": 1
+        }
+        
+        response = self.client.post('/mcp/command', json={"type": "get_scene_info"})
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+        self.assertNotIn("retry_after", json.loads(response.data))
+
     @patch('rest_to_socket_proxy.load_command_schema')
     def test_schema_endpoint(self, mock_load_schema):
         """Test the schema endpoint"""
@@ -134,6 +196,30 @@ class TestRestApi(unittest.TestCase):
         self.assertEqual(data["schema_version"], "1.0")
         self.assertTrue("create_node" in data["commands"])
         
+    def test_trailing_slash_is_not_redirected(self):
+        """Test that routes answer directly when the URL has a trailing slash"""
+        response = self.client.get('/mcp/schema/')
+        self.assertEqual(response.status_code, 200)
+        
+    def test_schema_file_is_read_once(self):
+        """Test that the schema file is only parsed again after it changes"""
+        first = load_command_schema()
+        with patch('builtins.open', side_effect=AssertionError("schema file re-read")):
+            second = load_command_schema()
+            response = self.client.get('/mcp/schema')
+        
+        self.assertIs(first, second)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), first)
+
+    def test_unchanged_schema_is_not_resent(self):
+        """Test that a client holding the current schema gets a 304 without a body"""
+        etag = self.client.get('/mcp/schema').headers["ETag"]
+        response = self.client.get('/mcp/schema', headers={"If-None-Match": etag})
+        
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        
     @patch('rest_to_socket_proxy.load_command_schema')
     def test_command_schema_endpoint(self, mock_load_schema):
         """Test the command-specific schema endpoint"""
@@ -183,5 +269,108 @@ class TestRestApi(unittest.TestCase):
         self.assertEqual(data["status"], "error")
         self.assertEqual(data["message"], "Command 'non_existent_command' not found in schema")
 
+class TestSocketPool(unittest.TestCase):
+    """Test cases for the keep-alive connection pool"""
+
+    def setUp(self):
+        """Listen on an ephemeral port for the pool to connect to"""
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(('localhost', 0))
+        self.listener.listen(4)
+        self.pool = SocketPool('localhost', self.listener.getsockname()[1], size=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.listener.close()
+
+    def test_released_connection_is_reused(self):
+        """Test that a released connection is handed out again"""
+        with self.pool.connection() as (first, reused):
+            self.assertFalse(reused)
+        with self.pool.connection() as (second, reused):
+            self.assertTrue(reused)
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.stats()["created"], 1)
+        self.assertEqual(self.pool.stats()["reused"], 1)
+
+    def test_closed_connection_is_discarded(self):
+        """Test that connections closed by the server are not reused"""
+        with self.pool.connection() as (first, _):
+            server_side, _ = self.listener.accept()
+        server_side.close()
+        # Wait for the FIN to arrive
+        select.select([first], [], [], 1.0)
+        
+        with self.pool.connection() as (second, reused):
+            self.assertFalse(reused)
+        self.assertIsNot(first, second)
+
+    def test_failed_exchange_discards_connection(self):
+        """Test that a connection is closed, not pooled, when its block raises"""
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as (sock, _):
+                raise ValueError("unparseable response")
+        self.assertEqual(sock.fileno(), -1)
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+    def test_busy_pool_raises_after_queue_timeout(self):
+        """Test that requests beyond the pool size wait, then give up"""
+        self.pool.queue_timeout = 0.05
+        with self.pool.connection(), self.pool.connection():
+            self.assertEqual(self.pool.stats()["in_use"], 2)
+            with self.assertRaises(PoolExhausted):
+                with self.pool.connection():
+                    pass
+        self.assertEqual(self.pool.stats(), {"size": 2, "in_use": 0, "idle": 2, "created": 2, "reused": 0})
+
+    def _serve(self, replies, skip=0):
+        """Answer commands on one accepted connection (after skipping some); a None reply hangs up"""
+        received = []
+        def serve():
+            held = [self.listener.accept()[0] for _ in range(skip)]
+            conn, _ = self.listener.accept()
+            with conn:
+                for reply in replies:
+                    received.append(rest_to_socket_proxy._recv_framed(conn))
+                    if reply is None:
+                        break
+                    rest_to_socket_proxy._send_framed(conn, reply)
+            for sock in held:
+                sock.close()
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        return thread, received
+
+    def test_lost_response_is_not_resent(self):
+        """Test that a command is not replayed when its response never arrives"""
+        thread, received = self._serve([{"status": "success"}, None])
+        with patch.object(rest_to_socket_proxy, '_pool', self.pool):
+            self.assertEqual(send_to_socket({"type": "get_scene_info"})["status"], "success")
+            response = send_to_socket({"type": "create_node", "params": {}})
+        thread.join(1.0)
+        self.assertEqual(response["status"], "error")
+        self.assertEqual([command["type"] for command in received], ["get_scene_info", "create_node"])
+        self.assertEqual(self.pool.stats()["created"], 1)
+
+    def test_unsent_command_is_retried(self):
+        """Test that a pooled connection that breaks while sending is replaced once"""
+        with self.pool.connection():
+            pass
+        thread, received = self._serve([{"status": "success"}], skip=1)
+        real_send = rest_to_socket_proxy._send_framed
+        calls = []
+        def flaky_send(sock, obj):
+            calls.append(obj)
+            if len(calls) == 1:
+                raise BrokenPipeError("stale connection")
+            real_send(sock, obj)
+        with patch.object(rest_to_socket_proxy, '_pool', self.pool), \
+             patch.object(rest_to_socket_proxy, '_send_framed', flaky_send):
+            response = send_to_socket({"type": "create_node", "params": {}})
+        thread.join(1.0)
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(len(received), 1)
+        self.assertEqual(self.pool.stats()["created"], 2)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import unittest
 import json
 import socket
+import struct
 import sys
 import os
 import threading
@@ -196,5 +197,85 @@ class TestSocketServer(unittest.TestCase):
         self.assertIn("missing", response["message"].lower())
         self.assertIn("type", response["message"].lower())
 
+    def _send_and_receive(self, payload):
+        """Send raw bytes to the server and return the parsed JSON response"""
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.connect(('localhost', self.test_port))
+        client.sendall(payload)
+        
+        response_data = b''
+        client.settimeout(2)
+        
+        try:
+            while True:
+                chunk = client.recv(4096)
+                if not chunk:
+                    break
+                response_data += chunk
+                
+                try:
+                    json.loads(response_data.decode('utf-8'))
+                    break
+                except json.JSONDecodeError:
+                    continue
+        except socket.timeout:
+            self.fail("Timed out waiting for response")
+        finally:
+            client.close()
+            
+        return json.loads(response_data.decode('utf-8'))
+        
+    def test_pre_serialized_response(self):
+        """Test that a payload serialized by the executor is sent without re-encoding"""
+        self.mock_command_executor.return_value = {
+            "status": "success",
+            "message": "Command executed successfully",
+            "_serialized": b'{"status": "success", "message": "Sent as-is"}'
+        }
+        
+        response = self._send_and_receive(json.dumps({"type": "get_scene_info"}).encode('utf-8'))
+        
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["message"], "Sent as-is")
+        self.assertNotIn("_serialized", response)
+
+    def test_framed_command(self):
+        """Test that length-prefixed commands get length-prefixed responses"""
+        body = json.dumps({"type": "get_scene_info"}).encode('utf-8')
+        client = socket.create_connection(('localhost', self.test_port))
+        client.settimeout(2)
+        try:
+            client.sendall(struct.pack('>I', len(body)) + body)
+            reader = client.makefile('rb')
+            (length,) = struct.unpack('>I', reader.read(4))
+            response = json.loads(reader.read(length))
+        finally:
+            client.close()
+        
+        self.assertEqual(response["status"], "success")
+        args, _ = self.mock_command_executor.call_args
+        self.assertEqual(args[0]["type"], "get_scene_info")
+
+    def test_framed_command_split_across_sends(self):
+        """Test that a frame whose body arrives in several pieces is handled once complete"""
+        body = json.dumps({"type": "execute_houdini_code", "params": {"code": "x" * 200000}}).encode('utf-8')
+        frame = struct.pack('>I', len(body)) + body
+        client = socket.create_connection(('localhost', self.test_port))
+        client.settimeout(2)
+        try:
+            for i in range(0, len(frame), 4096):
+                client.sendall(frame[i:i + 4096])
+                time.sleep(0.001)
+            reader = client.makefile('rb')
+            (length,) = struct.unpack('>I', reader.read(4))
+            response = json.loads(reader.read(length))
+        finally:
+            client.close()
+        
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(self.mock_command_executor.call_count, 1)
+        args, _ = self.mock_command_executor.call_args
+        self.assertEqual(len(args[0]["params"]["code"]), 200000)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file